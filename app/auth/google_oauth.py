@@ -1,12 +1,20 @@
+from typing import Optional
 from authlib.integrations.starlette_client import OAuth
 from app.config import settings
 
-oauth=OAuth()
+_oauth: Optional[OAuth] = None
 
-oauth.register(
-    name='google',
-    server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
-    client_id=settings.google_client_id,
-    client_secret=settings.google_client_secret,
-    client_kwargs={"scope": "openid email profile"},
-)
\ No newline at end of file
+def get_oauth() -> OAuth:
+    """OAuth registry with the Google client, registered on the first login instead of at import"""
+    global _oauth
+    if _oauth is None:
+        oauth = OAuth()
+        oauth.register(
+            name='google',
+            server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
+            client_id=settings.google_client_id,
+            client_secret=settings.google_client_secret,
+            client_kwargs={"scope": "openid email profile"},
+        )
+        _oauth = oauth
+    return _oauth
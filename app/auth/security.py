@@ -5,10 +5,12 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from jose.exceptions import ExpiredSignatureError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
-from app.services.redis_service import redis_service
-from app.database import get_db
+from app.services.async_redis import async_redis
+from app.services.user_cache import user_cache
+from app.database import get_async_db
 from app.models.user import User
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -35,18 +37,15 @@ def create_access_token(data: dict, expires_minutes: Optional[int] = None) -> st
     }
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
-def get_current_user(
-    db: Session = Depends(get_db),
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(oauth2_scheme),
 ) -> User:
     """Get current authenticated user from JWT token with blacklist check"""
-    # Check if token is blacklisted
-    if redis_service.is_token_blacklisted(token):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has been invalidated",
-        )
-    
+    return await authenticate_token(db, token)
+
+async def authenticate_token(db: AsyncSession, token: str) -> User:
+    """Resolve a bearer token to an active user; for callers that can't use the header (e.g. EventSource)"""
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         user_id = payload.get("sub")
@@ -69,8 +68,22 @@ def get_current_user(
             detail="Could not validate credentials",
         )
 
-    # Load user
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    # Blacklist and logout-all-devices checks share one Redis round trip
+    is_blacklisted, user_logout_time = await async_redis.check_token_state(token, str(user_id))
+    if is_blacklisted:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been invalidated",
+        )
+
+    # Load user, from the principal cache when possible
+    principal = await user_cache.get_async(int(user_id))
+    if principal is not None:
+        user = await db.run_sync(lambda session: user_cache.attach(session, principal))
+    else:
+        user = (await db.execute(select(User).where(User.id == int(user_id)))).scalars().first()
+        if user:
+            await user_cache.put_async(user)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -83,19 +96,17 @@ def get_current_user(
         )
     
     # Invalidate if user performed "logout from all devices" after this token was issued
-    if issued_at:
-        user_logout_time = redis_service.get_user_logout_time(str(user.id))
-        if user_logout_time:
-            # Handle both timestamp formats
-            if isinstance(issued_at, (int, float)):
-                token_issued_time = datetime.fromtimestamp(issued_at, tz=timezone.utc)
-            else:
-                token_issued_time = issued_at
-            
-            if user_logout_time > token_issued_time:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Token invalidated due to security logout",
-                )
+    if issued_at and user_logout_time:
+        # Handle both timestamp formats
+        if isinstance(issued_at, (int, float)):
+            token_issued_time = datetime.fromtimestamp(issued_at, tz=timezone.utc)
+        else:
+            token_issued_time = issued_at
+        
+        if user_logout_time > token_issued_time:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token invalidated due to security logout",
+            )
     
     return user
@@ -1,6 +1,8 @@
-from app.billing.timeutils import now_utc, add_calendar_months
+from app.billing.timeutils import now_utc, add_calendar_months, start_of_next_utc_month
 from app.billing.plans import PLANS, FREE_PLAN_ID
 from app.models.user import User
+from app.services.user_cache import user_cache
+from app.billing.ledger import record_balance_set
 
 def assign_paid_plan(user: User, plan_id: int):
     spec = PLANS[plan_id]
@@ -10,8 +12,11 @@ def assign_paid_plan(user: User, plan_id: int):
     user.plan_started_at = now
     user.billing_anchor_utc = now
     user.plan_expires_at = add_calendar_months(now, spec.duration_months)
+    record_balance_set(user, spec.monthly_credits, "plan_assigned")
     user.credit_balance = spec.monthly_credits
     user.last_credit_reset_at = now
+    user.next_credit_reset_at = add_calendar_months(now, 1)
+    user_cache.invalidate_on_commit(user)
 
 def revert_to_free(user: User):
     now = now_utc()
@@ -19,5 +24,8 @@ def revert_to_free(user: User):
     user.plan_started_at = None
     user.plan_expires_at = None
     user.billing_anchor_utc = None
+    record_balance_set(user, PLANS[FREE_PLAN_ID].monthly_credits, "plan_reverted")
     user.credit_balance = PLANS[FREE_PLAN_ID].monthly_credits
     user.last_credit_reset_at = now
+    user.next_credit_reset_at = start_of_next_utc_month(now)
+    user_cache.invalidate_on_commit(user)
@@ -1,12 +1,62 @@
 # app/billing/enforce.py
+from typing import Optional
 from fastapi import HTTPException
-from app.models.user import User
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.user import User
+from app.models.credit_ledger import CreditLedger
+from app.billing.ledger import record_entry
+from app.services.user_cache import user_cache
+from app.services.metrics import CREDIT_DEBITS, CREDITS_DEBITED
 
-def ensure_credits_or_admin(current_user: User, db: Session, cost: int):
+def ensure_credits_or_admin(
+    current_user: User,
+    db: Session,
+    cost: int,
+    transformation_type: Optional[str] = None,
+    image_id: Optional[int] = None,
+) -> Optional[CreditLedger]:
+    """
+    Debit cost credits with a single conditional UPDATE ... RETURNING and add the
+    matching ledger row. Nothing is committed here: the caller commits the debit
+    together with the work it pays for, and a rollback undoes both. Flush that
+    work first and pass its image_id; ledger rows are never updated.
+    """
     if current_user.is_admin:
-        return
-    if current_user.credit_balance < cost:
+        return None
+    new_balance = db.execute(
+        update(User)
+        .where(User.id == current_user.id, User.credit_balance >= cost)
+        .values(credit_balance=User.credit_balance - cost)
+        .returning(User.credit_balance)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if new_balance is None:
         raise HTTPException(status_code=402, detail="Not enough credits")
-    current_user.credit_balance -= cost
-    db.commit()
\ No newline at end of file
+    set_committed_value(current_user, "credit_balance", new_balance)
+    user_cache.invalidate_on_commit(current_user)
+    CREDIT_DEBITS.inc(transformation_type or "unknown")
+    CREDITS_DEBITED.inc(transformation_type or "unknown", amount=cost)
+    return record_entry(db, current_user.id, -cost, new_balance, "debit", transformation_type, image_id)
+
+def refund_credits(
+    current_user: User,
+    db: Session,
+    cost: int,
+    transformation_type: Optional[str] = None,
+    image_id: Optional[int] = None,
+) -> Optional[CreditLedger]:
+    """Return credits for work that failed after its debit was committed; caller commits"""
+    if current_user.is_admin:
+        return None
+    new_balance = db.execute(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(credit_balance=User.credit_balance + cost)
+        .returning(User.credit_balance)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+    set_committed_value(current_user, "credit_balance", new_balance)
+    user_cache.invalidate_on_commit(current_user)
+    return record_entry(db, current_user.id, cost, new_balance, "refund", transformation_type, image_id)
@@ -0,0 +1,114 @@
+import logging
+import os
+import socket
+import time
+import zlib
+from datetime import timedelta
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+from sqlalchemy import or_, and_, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import engine, SessionLocal
+from app.models.job_run import JobRun
+from app.services.redis_service import redis_service
+from app.services.metrics import JOB_SECONDS
+from app.billing.timeutils import now_utc
+
+logger = logging.getLogger("ssnapify.billing")
+
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+@contextmanager
+def job_lease(job_name: str) -> Iterator[bool]:
+    """
+    Cluster-wide mutual exclusion for a job. Yields True if this instance holds
+    the lease. Uses a Postgres session advisory lock when available (needs a
+    session-pooled connection), else a Redis SET NX lease, else runs locally.
+    """
+    if engine.dialect.name == "postgresql":
+        lock_key = zlib.crc32(job_name.encode())
+        # Autocommit so the held connection is not left idle in an open transaction
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": lock_key}).scalar()
+            try:
+                yield bool(acquired)
+            finally:
+                if acquired:
+                    conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": lock_key})
+        return
+    if redis_service.available:
+        lease_key = f"job_lease:{job_name}"
+        token = redis_service.acquire_lease(lease_key, settings.job_lease_ttl_seconds)
+        try:
+            yield token is not None
+        finally:
+            if token:
+                redis_service.release_lease(lease_key, token)
+        return
+    # Single-instance deployments (SQLite, no Redis) have nobody to race
+    yield True
+
+def _claim_run(db: Session, job_name: str, run_key: str) -> Optional[JobRun]:
+    """Insert the run's slot, or take over a failed run or one whose holder died mid-job"""
+    run = JobRun(job_name=job_name, run_key=run_key, instance=INSTANCE_ID, status="running")
+    db.add(run)
+    try:
+        db.commit()
+        return run
+    except IntegrityError:
+        db.rollback()
+    now = now_utc()
+    stale_before = now - timedelta(seconds=settings.job_lease_ttl_seconds)
+    run_id = db.execute(
+        update(JobRun)
+        .where(
+            JobRun.job_name == job_name,
+            JobRun.run_key == run_key,
+            or_(JobRun.status == "failed", and_(JobRun.status == "running", JobRun.started_at < stale_before)),
+        )
+        .values(instance=INSTANCE_ID, status="running", started_at=now, finished_at=None, duration_ms=None, detail=None)
+        .returning(JobRun.id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    db.commit()
+    if run_id is None:
+        return None
+    logger.info(f"Job {job_name} [{run_key}] retrying an unfinished run")
+    return db.get(JobRun, run_id)
+
+def run_job(job_name: str, func: Callable[[], Any], run_key: Optional[str] = None) -> Optional[JobRun]:
+    """
+    Run func at most once per (job_name, run_key) across all instances and record
+    the outcome in job_runs. A failed run, or one stuck at 'running' past the lease
+    TTL, may be retried. Returns the JobRun, or None if another instance ran it.
+    """
+    run_key = run_key or f"manual:{now_utc().isoformat()}"
+    with job_lease(job_name) as leader:
+        if not leader:
+            logger.info(f"Job {job_name} [{run_key}] is running on another instance; skipping")
+            return None
+        # Keep the run's attributes loaded so callers can read them after close
+        db: Session = SessionLocal(expire_on_commit=False)
+        try:
+            run = _claim_run(db, job_name, run_key)
+            if run is None:
+                logger.info(f"Job {job_name} [{run_key}] already ran; skipping")
+                return None
+            started = time.perf_counter()
+            try:
+                run.detail = func()
+                run.status = "succeeded"
+            except Exception as e:
+                logger.exception(f"Job {job_name} [{run_key}] failed")
+                run.detail = {"error": f"{type(e).__name__}: {e}"}
+                run.status = "failed"
+            run.finished_at = now_utc()
+            run.duration_ms = int((time.perf_counter() - started) * 1000)
+            JOB_SECONDS.observe(run.duration_ms / 1000, job_name, run.status)
+            db.commit()
+            logger.info(f"Job {job_name} [{run_key}] {run.status} in {run.duration_ms}ms on {INSTANCE_ID}")
+            return run
+        finally:
+            db.close()
@@ -0,0 +1,45 @@
+from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.user import User
+from app.models.credit_ledger import CreditLedger
+
+def record_entry(
+    db: Session,
+    user_id: int,
+    delta: int,
+    balance_after: int,
+    reason: str,
+    transformation_type: Optional[str] = None,
+    image_id: Optional[int] = None,
+) -> CreditLedger:
+    # Added to the caller's transaction; committed together with the balance change
+    entry = CreditLedger(
+        user_id=user_id,
+        delta=delta,
+        balance_after=balance_after,
+        reason=reason,
+        transformation_type=transformation_type,
+        image_id=image_id,
+    )
+    db.add(entry)
+    return entry
+
+def record_balance_set(user: User, new_balance: int, reason: str):
+    """Ledger entry for paths that assign a balance outright (resets, plan changes); call before assigning"""
+    db = object_session(user)
+    if db is None or user.id is None:
+        return
+    # Delta from the locked row, not the in-memory value, which may come from the principal cache
+    old_balance = db.execute(
+        select(User.credit_balance).where(User.id == user.id).with_for_update()
+    ).scalar_one() or 0
+    set_committed_value(user, "credit_balance", old_balance)
+    if new_balance == old_balance:
+        return
+    record_entry(db, user.id, new_balance - old_balance, new_balance, reason)
+
+def reconstruct_balance(db: Session, user_id: int) -> int:
+    """Replay the ledger; matches users.credit_balance for accounts created after the ledger existed"""
+    return db.query(func.coalesce(func.sum(CreditLedger.delta), 0)).filter(CreditLedger.user_id == user_id).scalar()
@@ -14,3 +14,20 @@ PLANS: dict[int, PlanSpec] = {
     MONTHLY_PLAN_ID: PlanSpec(monthly_credits=50, duration_months=1),
     SEMIANNUAL_PLAN_ID: PlanSpec(monthly_credits=100, duration_months=6),
 }
+
+@dataclass(frozen=True)
+class RateLimit:
+    per_minute: float   # sustained rate (token refill)
+    burst: int          # bucket capacity: back-to-back requests allowed after idling
+
+# Free-plan limits per route group; paid plans scale by monthly_credits relative to Free
+RATE_LIMITS: dict[str, RateLimit] = {
+    "upload": RateLimit(per_minute=10, burst=5),
+    "transform": RateLimit(per_minute=6, burst=3),
+}
+
+def rate_limit_for(plan_id: int | None, group: str) -> RateLimit:
+    base = RATE_LIMITS[group]
+    plan = PLANS.get(plan_id, PLANS[FREE_PLAN_ID])
+    scale = plan.monthly_credits / PLANS[FREE_PLAN_ID].monthly_credits
+    return RateLimit(per_minute=base.per_minute * scale, burst=max(1, round(base.burst * scale)))
@@ -1,39 +1,64 @@
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, object_session
 from app.models.user import User
+from app.services.user_cache import user_cache
+from app.billing.ledger import record_balance_set
 from app.billing.plans import PLANS, FREE_PLAN_ID
-from app.billing.timeutils import now_utc, start_of_utc_month, add_calendar_months
+from app.billing.timeutils import as_utc, now_utc, start_of_utc_month, start_of_next_utc_month, add_calendar_months, months_between
+
+def paid_cycle_months(anchor_utc: datetime, current_utc: datetime) -> int:
+    # Closed form: the largest n with anchor + n months not in the future.
+    # Boundaries are always measured from the anchor, so a 31st anchor stays on
+    # month-end instead of drifting to the 28th after February.
+    anchor_utc = as_utc(anchor_utc)
+    months = max(months_between(anchor_utc, current_utc), 0)
+    if add_calendar_months(anchor_utc, months) > current_utc and months > 0:
+        months -= 1
+    return months
 
 def compute_paid_cycle_start(anchor_utc: datetime, current_utc: datetime):
     # If no anchor, fall back to calendar month start
     if anchor_utc is None:
         return start_of_utc_month(current_utc)
-    cycle_start = anchor_utc
-    # Advance by months until next boundary is in the future
-    while True:
-        next_boundary = add_calendar_months(cycle_start, 1)
-        if next_boundary > current_utc:
-            return cycle_start
-        cycle_start = next_boundary
+    return add_calendar_months(as_utc(anchor_utc), paid_cycle_months(anchor_utc, current_utc))
+
+def compute_paid_cycle_end(anchor_utc: datetime, current_utc: datetime):
+    # Counted from the anchor too: cycle_start + 1 month would turn a 29th-31st anchor into the 28th after February
+    if anchor_utc is None:
+        return start_of_next_utc_month(current_utc)
+    return add_calendar_months(as_utc(anchor_utc), paid_cycle_months(anchor_utc, current_utc) + 1)
+
+def compute_next_reset_at(user: User, current_utc: datetime) -> datetime:
+    """Next boundary at which the user's billing state changes (reset, or expiry for paid plans)"""
+    if user.plan_id == FREE_PLAN_ID or user.billing_anchor_utc is None:
+        return start_of_next_utc_month(current_utc)
+    return compute_paid_cycle_end(user.billing_anchor_utc, current_utc)
+
+def is_billing_due(user: User, current_utc: datetime) -> bool:
+    # Request-time fast path: one indexed timestamp comparison
+    return user.next_credit_reset_at is None or as_utc(user.next_credit_reset_at) <= current_utc
 
 def is_reset_due_free(user: User, current_utc: datetime):
     cycle_start = start_of_utc_month(current_utc)
-    last = user.last_credit_reset_at
+    last = as_utc(user.last_credit_reset_at)
     return (last is None) or (last < cycle_start), cycle_start
 
 def is_reset_due_paid(user: User, current_utc: datetime) -> tuple[bool, datetime]:
     cycle_start = compute_paid_cycle_start(user.billing_anchor_utc, current_utc)
-    last = user.last_credit_reset_at
+    last = as_utc(user.last_credit_reset_at)
     return (last is None) or (last < cycle_start), cycle_start
 
 def handle_expiration(user: User, current_utc: datetime) -> bool:
-    if user.plan_expires_at and user.plan_expires_at <= current_utc:
+    if user.plan_expires_at and as_utc(user.plan_expires_at) <= current_utc:
         user.plan_id = FREE_PLAN_ID
         user.plan_started_at = None
         user.plan_expires_at = None
         user.billing_anchor_utc = None
+        record_balance_set(user, PLANS[FREE_PLAN_ID].monthly_credits, "plan_expired")
         user.credit_balance = PLANS[FREE_PLAN_ID].monthly_credits
         user.last_credit_reset_at = current_utc
+        user.next_credit_reset_at = start_of_next_utc_month(current_utc)
+        user_cache.invalidate_on_commit(user)
         return True
     return False
 
@@ -47,6 +72,34 @@ def apply_monthly_reset(user: User, current_utc: datetime) -> bool:
     if not due:
         return False
     
+    record_balance_set(user, spec.monthly_credits, "monthly_reset")
     user.credit_balance = spec.monthly_credits
     user.last_credit_reset_at = current_utc
+    user.next_credit_reset_at = compute_next_reset_at(user, current_utc)
+    user_cache.invalidate_on_commit(user)
     return True
+
+def apply_due_billing(user: User, current_utc: datetime) -> bool:
+    """
+    Expire and reset the user if their next boundary has passed. Returns True when
+    the row changed and needs a commit; a no-op costs only the timestamp comparison.
+    Needs a sync session: from async routes call it through AsyncSession.run_sync.
+    """
+    if not is_billing_due(user, current_utc):
+        return False
+    # The principal may be a cached copy; reload the row under a lock so a second
+    # worker sees the first one's reset instead of re-running it over newer debits
+    db = object_session(user)
+    if db is not None and user.id is not None:
+        db.refresh(user, with_for_update=True)
+        if not is_billing_due(user, current_utc):
+            return False
+    changed = handle_expiration(user, current_utc)
+    changed = apply_monthly_reset(user, current_utc) or changed
+    # Also backfills rows created before next_credit_reset_at existed
+    next_reset = compute_next_reset_at(user, current_utc)
+    if as_utc(user.next_credit_reset_at) != next_reset:
+        user.next_credit_reset_at = next_reset
+        user_cache.invalidate_on_commit(user)
+        changed = True
+    return changed
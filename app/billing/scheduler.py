@@ -1,39 +1,162 @@
+import logging
+import time
+from apscheduler.schedulers.base import BaseScheduler
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import select, update, insert, literal, or_, func
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.database import SessionLocal
 from app.models.user import User
-from app.billing.timeutils import now_utc
-from app.billing.resets import handle_expiration, apply_monthly_reset
+from app.models.credit_ledger import CreditLedger
+from app.billing.plans import PLANS, FREE_PLAN_ID
+from app.billing.timeutils import as_utc, now_utc, start_of_utc_month, start_of_next_utc_month
+from app.billing.resets import compute_paid_cycle_start, compute_paid_cycle_end
+from app.billing.jobs import run_job
+from app.services.user_cache import user_cache
+from app.services.content_version import bump_content_version
 
-def reset_all_users():
+logger = logging.getLogger("ssnapify.billing")
+
+def _reset_where(db: Session, where: tuple, values: dict, credits, reason: str) -> list[int]:
+    """Write ledger rows for the balance change, then apply it as one UPDATE; returns touched ids"""
+    balance = func.coalesce(User.credit_balance, 0)
+    db.execute(
+        insert(CreditLedger).from_select(
+            ["user_id", "delta", "balance_after", "reason"],
+            select(User.id, credits - balance, credits, literal(reason)).where(*where, balance != credits),
+        )
+    )
+    return db.execute(
+        update(User)
+        .where(*where)
+        .values(**values)
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+def reset_all_users(batch_size: int | None = None) -> list[dict]:
     """
-    Run expirations and resets for all users.
-    For large datasets, switch to batched queries or SQL UPDATEs.
+    Run expirations and resets for every user whose next_credit_reset_at has
+    passed, as set-based UPDATEs, one primary-key batch per transaction.
+    Rows with no next_credit_reset_at yet are treated as due and backfilled.
+    Returns per-batch stats.
     """
+    batch_size = batch_size or settings.billing_batch_size
+    current = now_utc()
+    month_start = start_of_utc_month(current)
+    next_month_start = start_of_next_utc_month(current)
+    free_credits = literal(PLANS[FREE_PLAN_ID].monthly_credits)
+    is_due = or_(User.next_credit_reset_at.is_(None), User.next_credit_reset_at <= current)
+    stats = []
+    last_id = 0
     db: Session = SessionLocal()
     try:
-        current = now_utc()
-        # Simple approach: iterate. For scale, paginate by primary key ranges.
-        users = db.query(User).all()
-        any_changes = False
-        for user in users:
-            changed = False
-            # 1) Expiration check (flip to free if expired)
-            if handle_expiration(user, current):
-                changed = True
-            # 2) Reset check (free or paid cycle)
-            if apply_monthly_reset(user, current):
-                changed = True
-            if changed:
-                any_changes = True
-        if any_changes:
+        while True:
+            started = time.perf_counter()
+            ids = db.execute(
+                select(User.id).where(is_due, User.id > last_id).order_by(User.id).limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+            in_batch = (User.id >= ids[0], User.id <= ids[-1], is_due)
+
+            # 1) Expiration (flip to free); runs first so step 2 sees the fresh reset time
+            expired = _reset_where(
+                db,
+                (*in_batch, User.plan_expires_at <= current),
+                {
+                    "plan_id": FREE_PLAN_ID,
+                    "plan_started_at": None,
+                    "plan_expires_at": None,
+                    "billing_anchor_utc": None,
+                    "credit_balance": free_credits,
+                    "last_credit_reset_at": current,
+                    "next_credit_reset_at": next_month_start,
+                },
+                free_credits,
+                "plan_expired",
+            )
+            # 2) Free plan: reset once per calendar month
+            free_reset = _reset_where(
+                db,
+                (
+                    *in_batch,
+                    User.plan_id == FREE_PLAN_ID,
+                    or_(User.last_credit_reset_at.is_(None), User.last_credit_reset_at < month_start),
+                ),
+                {"credit_balance": free_credits, "last_credit_reset_at": current, "next_credit_reset_at": next_month_start},
+                free_credits,
+                "monthly_reset",
+            )
+            # Free rows still due were already reset this month; just move their boundary
+            db.execute(
+                update(User)
+                .where(*in_batch, User.plan_id == FREE_PLAN_ID)
+                .values(next_credit_reset_at=next_month_start)
+                .execution_options(synchronize_session=False)
+            )
+            # 3) Paid plans: boundaries are anchored per user, so compute them from narrow rows
+            #    and apply them with one executemany UPDATE keyed by primary key
+            paid_rows = db.execute(
+                select(User.id, User.plan_id, User.credit_balance, User.billing_anchor_utc, User.last_credit_reset_at)
+                .where(*in_batch, User.plan_id != FREE_PLAN_ID)
+            ).all()
+            paid_updates, ledger_rows = [], []
+            for user_id, plan_id, balance, anchor, last in paid_rows:
+                cycle_start = compute_paid_cycle_start(anchor, current)
+                row = {"id": user_id, "next_credit_reset_at": compute_paid_cycle_end(anchor, current)}
+                if last is None or as_utc(last) < cycle_start:
+                    credits = PLANS.get(plan_id, PLANS[FREE_PLAN_ID]).monthly_credits
+                    row.update(credit_balance=credits, last_credit_reset_at=current)
+                    if credits != (balance or 0):
+                        ledger_rows.append({
+                            "user_id": user_id,
+                            "delta": credits - (balance or 0),
+                            "balance_after": credits,
+                            "reason": "monthly_reset",
+                        })
+                paid_updates.append(row)
+            paid_reset = [row["id"] for row in paid_updates if "credit_balance" in row]
+            if ledger_rows:
+                db.execute(insert(CreditLedger), ledger_rows)
+            if paid_updates:
+                # Rows without a reset only carry next_credit_reset_at; group by key set for executemany
+                for keys in {tuple(sorted(row)) for row in paid_updates}:
+                    db.execute(update(User), [row for row in paid_updates if tuple(sorted(row)) == keys])
+
             db.commit()
+            changed = {*expired, *free_reset, *(row["id"] for row in paid_updates)}
+            user_cache.invalidate_many(changed)
+            bump_content_version(*changed)
+            batch = {
+                "first_id": ids[0],
+                "last_id": ids[-1],
+                "scanned": len(ids),
+                "expired": len(expired),
+                "free_reset": len(free_reset),
+                "paid_reset": len(paid_reset),
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+            logger.info("Billing reset batch %s", batch)
+            stats.append(batch)
+            last_id = ids[-1]
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
+    return stats
+
+def run_daily_reset():
+    # One run per UTC day cluster-wide, however many schedulers fire
+    return run_job("reset_all_users", reset_all_users, run_key=now_utc().date().isoformat())
+
+def add_billing_jobs(scheduler: BaseScheduler):
+    # Run at 00:05 UTC every day (handle all resets/expirations that became due)
+    scheduler.add_job(run_daily_reset, CronTrigger(hour=0, minute=5, timezone="UTC"), id="reset_all_users")
 
 def start_scheduler():
     scheduler = BackgroundScheduler(timezone="UTC")  # ensure UTC schedule
-    # Run at 00:05 UTC every day (handle all resets/expirations that became due)
-    scheduler.add_job(reset_all_users, CronTrigger(hour=0, minute=5, timezone="UTC"))
+    add_billing_jobs(scheduler)
     scheduler.start()
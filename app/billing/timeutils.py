@@ -3,9 +3,22 @@ from datetime import datetime, timezone
 def now_utc():
     return datetime.now(timezone.utc)
 
+def as_utc(dt: datetime | None):
+    # Some backends (SQLite) hand back naive datetimes; all stored times are UTC
+    if dt is not None and dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
 def start_of_utc_month(dt: datetime):
     return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
+def start_of_next_utc_month(dt: datetime):
+    return add_calendar_months(start_of_utc_month(dt), 1)
+
+def months_between(start: datetime, end: datetime) -> int:
+    # Whole calendar-month steps from start's month to end's month (day ignored)
+    return (end.year - start.year) * 12 + (end.month - start.month)
+
 def add_calendar_months(dt: datetime, months: int) -> datetime:
     # Safe calendar-month addition without external dependency
     year = dt.year + (dt.month - 1 + months) // 12
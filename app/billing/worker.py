@@ -0,0 +1,34 @@
+"""
+Standalone billing worker, for deployments that keep scheduled jobs out of the
+web process (set BILLING_SCHEDULER_IN_WEB=false there):
+
+    python -m app.billing.worker            # run the schedule in the foreground
+    python -m app.billing.worker --once     # run the daily reset now and exit
+"""
+import argparse
+import logging
+from apscheduler.schedulers.blocking import BlockingScheduler
+from app.billing.scheduler import add_billing_jobs, reset_all_users
+from app.billing.jobs import run_job
+
+logger = logging.getLogger("ssnapify.billing")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SSnapify billing worker")
+    parser.add_argument("--once", action="store_true", help="run the daily reset immediately and exit")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.once:
+        run = run_job("reset_all_users", reset_all_users)
+        if run is None:
+            logger.info("Another instance holds the reset_all_users lease")
+        return
+
+    scheduler = BlockingScheduler(timezone="UTC")
+    add_billing_jobs(scheduler)
+    logger.info("Billing worker started")
+    scheduler.start()
+
+if __name__ == "__main__":
+    main()
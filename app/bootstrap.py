@@ -0,0 +1,104 @@
+"""
+One-off setup that used to run on every app import:
+
+    python -m app.bootstrap            # create missing tables, upgrade existing ones, check Redis
+    python -m app.bootstrap --static   # also build fingerprinted assets (app.services.static_assets)
+
+Run it on deploy (or once per schema change) rather than on each cold start.
+create_all skips tables that already exist, so upgrade_schema adds the columns
+and indexes later releases put on them; every step checks first and is safe
+to re-run.
+"""
+import argparse
+import logging
+from sqlalchemy import Column, Table, inspect, select, update, bindparam
+from sqlalchemy.engine import Connection
+from app import models
+from app.config import settings
+from app.database import engine
+from app.billing.plans import FREE_PLAN_ID
+from app.billing.resets import compute_next_reset_at, is_reset_due_free, is_reset_due_paid
+from app.billing.timeutils import as_utc, now_utc
+from app.services.redis_service import redis_service
+
+logger = logging.getLogger("ssnapify")
+
+def ensure_column(conn: Connection, column: Column) -> bool:
+    """ALTER TABLE ... ADD COLUMN from the model definition, unless the column exists; True if added"""
+    table = column.table.name
+    if column.name in {existing["name"] for existing in inspect(conn).get_columns(table)}:
+        return False
+    spec = conn.dialect.ddl_compiler(conn.dialect, None).get_column_specification(column)
+    conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {spec}")
+    logger.info(f"✅ Added column {table}.{column.name}")
+    return True
+
+def ensure_index(conn: Connection, table: Table, name: str):
+    # Same as CREATE INDEX IF NOT EXISTS, with the model's column order and sort directions
+    index = next(index for index in table.indexes if index.name == name)
+    index.create(conn, checkfirst=True)
+
+def backfill_next_credit_reset_at(conn: Connection) -> int:
+    """
+    Rows from before next_credit_reset_at get their next boundary; rows with an
+    expiry or reset already pending are marked due now so the next request or
+    the daily job applies it.
+    """
+    users = models.User
+    current = now_utc()
+    rows = conn.execute(
+        select(users.id, users.plan_id, users.billing_anchor_utc, users.plan_expires_at, users.last_credit_reset_at)
+        .where(users.next_credit_reset_at.is_(None))
+    ).all()
+    updates = []
+    for row in rows:
+        is_reset_due = is_reset_due_free if row.plan_id == FREE_PLAN_ID else is_reset_due_paid
+        expired = row.plan_expires_at is not None and as_utc(row.plan_expires_at) <= current
+        due = expired or is_reset_due(row, current)[0]
+        updates.append({"b_id": row.id, "b_next": current if due else compute_next_reset_at(row, current)})
+    statement = update(users).where(users.id == bindparam("b_id")).values(next_credit_reset_at=bindparam("b_next"))
+    for start in range(0, len(updates), settings.billing_batch_size):
+        conn.execute(statement, updates[start:start + settings.billing_batch_size])
+    return len(updates)
+
+def upgrade_schema(conn: Connection):
+    """Bring tables created by older releases up to the current models"""
+    users, images = models.User.__table__, models.Image.__table__
+    # Keyset pagination of the gallery
+    ensure_index(conn, images, "ix_images_user_created_id")
+    # Filtered gallery (transformation_type) and the per-type counts
+    ensure_index(conn, images, "ix_images_user_type_created")
+    # Background transformation jobs; existing rows are finished images (server default 'ready')
+    ensure_column(conn, images.c.status)
+    ensure_column(conn, images.c.error)
+    # Upload dedup by content hash; older uploads keep NULL and are never matched
+    ensure_column(conn, images.c.content_hash)
+    ensure_index(conn, images, "ix_images_user_content_hash")
+    # Indexed reset boundary for the request fast path and the daily job
+    ensure_column(conn, users.c.next_credit_reset_at)
+    ensure_index(conn, users, "ix_users_next_credit_reset_at")
+    backfilled = backfill_next_credit_reset_at(conn)
+    if backfilled:
+        logger.info(f"✅ Backfilled next_credit_reset_at for {backfilled} users")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SSnapify bootstrap")
+    parser.add_argument("--static", action="store_true", help="build public/dist as well")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    models.Base.metadata.create_all(bind=engine)
+    logger.info("✅ Database tables created")
+    with engine.begin() as conn:
+        upgrade_schema(conn)
+    logger.info("✅ Database schema up to date")
+    if redis_service.ping():
+        logger.info("✅ Redis connected successfully")
+    else:
+        logger.warning("⚠️ Redis connection failed. Token blacklisting will not work.")
+    if args.static:
+        from app.services.static_assets import build
+        logger.info(f"✅ Built {len(build())} fingerprinted assets")
+
+if __name__ == "__main__":
+    main()
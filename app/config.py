@@ -1,8 +1,25 @@
 # config.py (add validation)
 import os
+from typing import Any, Dict, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import ValidationError
 
+# Connection pool shape per deployment (DB_PROFILE); DB_POOL_* settings override single values
+ENGINE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # One connection per use, returned straight to an external pooler (PgBouncer,
+    # Supavisor) that keeps server connections warm across short-lived instances
+    "serverless": {"pool": "null", "pool_pre_ping": False},
+    # Long-running uvicorn workers: warm pool, recycled ahead of server idle timeouts
+    # instead of a pre-ping round trip on every checkout
+    "pooled": {"pool": "queue", "pool_size": 5, "max_overflow": 10, "pool_timeout": 10, "pool_recycle": 1800, "pool_pre_ping": False},
+    # SQLite and test runs: one shared connection
+    "test": {"pool": "static", "pool_pre_ping": False},
+}
+# The profile sizes the request (async) engine. The sync engine only runs one
+# thing at a time (billing jobs, a transform worker's loop, bootstrap), so its
+# queue pool stays minimal: a pooled web process holds at most 15 + 3 connections.
+SYNC_QUEUE_POOL = {"pool_size": 1, "max_overflow": 2}
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
     @property
@@ -24,6 +41,69 @@ class Settings(BaseSettings):
     postgres_user: str
     postgres_password: str
     postgres_database: str
+    cloudinary_max_workers: int = 8        # threads dedicated to blocking Cloudinary SDK calls
+    cloudinary_max_concurrency: int = 16   # in-flight Cloudinary calls allowed before callers queue
+    max_upload_bytes: int = 10 * 1024 * 1024   # matches MAX_FILE_SIZE in public/js/config.js
+    upload_chunk_size: int = 6 * 1024 * 1024   # Cloudinary requires chunks of at least 5MB
+    redis_breaker_failure_threshold: int = 3      # consecutive Redis errors before failing fast
+    redis_breaker_reset_seconds: float = 10.0     # delay between background re-probes while open
+    redis_max_connections: int = 50           # asyncio command pool size per process
+    redis_pool_timeout: float = 2.0           # seconds to wait for a free pooled connection
+    redis_socket_timeout: float = 5.0
+    redis_retry_attempts: int = 2             # retries on connection errors, with exponential backoff
+    redis_backoff_base_seconds: float = 0.05
+    redis_backoff_cap_seconds: float = 1.0
+    redis_reconnect_cap_seconds: float = 120.0  # longest gap between reconnect probes while the circuit is open
+    user_cache_ttl_seconds: int = 30          # how long an authenticated principal may be served from cache
+    user_cache_max_entries: int = 10_000      # per-process LRU size
+    user_cache_use_redis: bool = True         # share principals across workers through Redis
+    billing_batch_size: int = 1000            # users per primary-key batch in the daily reset job
+    billing_scheduler_in_web: bool = True     # set False when `python -m app.billing.worker` runs the jobs
+    job_lease_ttl_seconds: int = 3600         # Redis lease expiry, in case a holder dies mid-job
+    transform_worker_enabled: bool = False    # queue transformations for workers; off (e.g. Vercel) renders lazily on first fetch
+    transform_queue: str = "transform_jobs"   # Redis list consumed by `python -m app.services.transform_worker`
+    transform_job_timeout_seconds: int = 900  # claimed jobs not finished within this are re-queued by the reaper
+    transform_max_attempts: int = 3           # claims per job before the reaper fails it and refunds the credits
+    create_tables_on_startup: bool = False    # dev convenience; deployments run `python -m app.bootstrap`
+    content_version_ttl_seconds: int = 30 * 24 * 3600   # idle lifetime of a user's ETag version counter
+    # serverless | pooled | test, see ENGINE_PROFILES; Vercel functions default to serverless
+    db_profile: str = "serverless" if os.environ.get("VERCEL") else "pooled"
+    db_pool_size: Optional[int] = None        # request engine connections kept open (queue pool only)
+    db_max_overflow: Optional[int] = None     # extra request engine connections under burst (queue pool only)
+    db_pool_timeout: Optional[float] = None   # seconds to wait for a checkout before failing (queue pool only)
+    db_pool_recycle: Optional[int] = None     # replace connections older than this many seconds
+    db_pool_pre_ping: Optional[bool] = None   # test each connection on checkout (one extra round trip)
+    health_check_cache_seconds: float = 10.0  # readiness probes reuse DB/Redis check results this long
+    health_requires_redis: bool = False       # report not-ready (503) when Redis is down, not just degraded
+    metrics_token: Optional[str] = None       # bearer token scrapers send to /health/metrics and /health/db; admins always pass
+    slow_query_ms: float = 250.0              # log SQL statements slower than this with their route (0 disables)
+    profiling_header: str = "X-Profile"       # admins send `X-Profile: 1` to profile a single request
+    profiling_sample_rate: float = 0.0        # fraction of other requests profiled automatically
+    profiling_interval_ms: float = 5.0        # stack sampling interval while a profile runs
+    profiling_max_concurrent: int = 4         # sampled profiles running at once; admin requests always run
+    profiling_max_reports: int = 100          # reports kept in memory per process
+    profiling_report_ttl_seconds: int = 3600  # reports shared across instances through Redis this long
+    rate_limit_enabled: bool = True           # per-user token buckets on upload and transform routes (RATE_LIMITS)
+    rate_limit_local_max_keys: int = 10000    # buckets kept in memory when Redis is unavailable
+
+    @property
+    def engine_profile(self) -> Dict[str, Any]:
+        """The DB_PROFILE defaults with any DB_POOL_* overrides applied"""
+        profile = dict(ENGINE_PROFILES[self.db_profile])
+        overrides = {
+            "pool_size": self.db_pool_size,
+            "max_overflow": self.db_max_overflow,
+            "pool_timeout": self.db_pool_timeout,
+            "pool_recycle": self.db_pool_recycle,
+            "pool_pre_ping": self.db_pool_pre_ping,
+        }
+        profile.update({key: value for key, value in overrides.items() if value is not None})
+        return profile
+
+    @property
+    def sync_engine_profile(self) -> Dict[str, Any]:
+        """engine_profile for the sync engine: same pool type and timings, SYNC_QUEUE_POOL sizes"""
+        return {**self.engine_profile, **SYNC_QUEUE_POOL}
 
     def validate(self):
         required_vars = [
@@ -33,8 +113,9 @@ class Settings(BaseSettings):
         for var in required_vars:
             if not getattr(self, var, None):
                 raise ValueError(f"Missing required config: {var}")
+        if self.db_profile not in ENGINE_PROFILES:
+            raise ValueError(f"Unknown DB_PROFILE {self.db_profile!r}; expected one of {', '.join(ENGINE_PROFILES)}")
 
-settings = Settings()
 try:
     settings = Settings()
     settings.validate()
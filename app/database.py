@@ -1,14 +1,167 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Any, Dict
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url, Engine, URL
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool, StaticPool
 from app.config import settings
+from app.services.metrics import record_db_query
 
-engine = create_engine(settings.patched_database_url,pool_pre_ping=True)
+# (sync, async) pool class per ENGINE_PROFILES "pool" name
+POOL_CLASSES = {
+    "null": (NullPool, NullPool),
+    "queue": (QueuePool, AsyncAdaptedQueuePool),
+    "static": (StaticPool, StaticPool),
+}
+QUEUE_ONLY_OPTIONS = ("pool_size", "max_overflow", "pool_timeout")
+
+class PoolStats:
+    """Checkout wait, occupancy and connection churn for one engine's pool"""
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.checkout_timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.connects = 0        # new DBAPI connections opened
+        self.closes = 0          # DBAPI connections closed (recycled, overflow, NullPool returns)
+        self.invalidations = 0   # connections discarded after errors
+        self.pool: Pool = None
+
+    def record_checkout(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            if timed_out:
+                self.checkout_timeouts += 1
+            else:
+                self.checkouts += 1
+
+    def count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "pool": type(self.pool).__name__,
+                "checkouts": self.checkouts,
+                "checked_out": self.checkouts - self.checkins,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_ms_avg": round(self.wait_seconds_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "checkout_wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "connects": self.connects,
+                "closes": self.closes,
+                "invalidations": self.invalidations,
+            }
+        if isinstance(self.pool, QueuePool):
+            stats.update(size=self.pool.size(), checked_in=self.pool.checkedin(), overflow=max(0, self.pool.overflow()))
+        return stats
+
+def _timed_pool(pool_class: type, stats: PoolStats) -> type:
+    # A subclass per engine: recreate() after dispose/invalidation keeps the class, and the stats with it
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = pool_class.connect(self)
+        except PoolTimeoutError:
+            stats.record_checkout(time.perf_counter() - started, timed_out=True)
+            raise
+        stats.record_checkout(time.perf_counter() - started)
+        return connection
+    return type(f"Timed{pool_class.__name__}", (pool_class,), {"connect": connect})
+
+def engine_options(url: URL, is_async: bool, stats: PoolStats) -> Dict[str, Any]:
+    """create_engine keyword arguments for settings.engine_profile (sync_engine_profile for the sync engine)"""
+    options = settings.engine_profile if is_async else settings.sync_engine_profile
+    pool_class = POOL_CLASSES[options.pop("pool")][is_async]
+    if pool_class not in (QueuePool, AsyncAdaptedQueuePool):
+        for option in QUEUE_ONLY_OPTIONS:
+            options.pop(option, None)
+    options["poolclass"] = _timed_pool(pool_class, stats)
+    connect_args = {}
+    if url.get_backend_name() == "sqlite":
+        connect_args["check_same_thread"] = False
+    elif is_async and pool_class is NullPool:
+        # Transaction-mode poolers hand each transaction a different server connection,
+        # so asyncpg's per-connection prepared statements can't be reused
+        connect_args.update(statement_cache_size=0, prepared_statement_cache_size=0)
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+def instrument(engine: Engine, stats: PoolStats):
+    stats.pool = engine.pool
+    event.listen(engine, "connect", lambda *args: stats.count("connects"))
+    event.listen(engine, "close", lambda *args: stats.count("closes"))
+    event.listen(engine, "close_detached", lambda *args: stats.count("closes"))
+    event.listen(engine, "invalidate", lambda *args: stats.count("invalidations"))
+    event.listen(engine, "checkin", lambda *args: stats.count("checkins"))
+    # dispose() swaps in a new pool
+    event.listen(engine, "engine_disposed", lambda *args: setattr(stats, "pool", engine.pool))
+    # Statement timings; a stack per connection because executes can nest (e.g. eager loads)
+    event.listen(engine, "before_cursor_execute", _start_query)
+    event.listen(engine, "after_cursor_execute", lambda conn, cursor, statement, *args: _end_query(conn, stats.name, statement))
+    event.listen(engine, "handle_error", lambda context: _end_query(context.connection, stats.name, context.statement) if context.connection is not None else None)
+
+def _start_query(conn, *args):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _end_query(conn, engine_name: str, statement: str):
+    started = conn.info.get("query_started")
+    if started:
+        record_db_query(engine_name, time.perf_counter() - started.pop(), statement)
+
+def async_database_url(database_url: str) -> URL:
+    """The same database through an asyncio driver: asyncpg for Postgres, aiosqlite for local SQLite"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        query = dict(url.query)
+        if "sslmode" in query:
+            # asyncpg takes ssl=, not libpq's sslmode=
+            query["ssl"] = query.pop("sslmode")
+        return url.set(drivername="postgresql+asyncpg", query=query)
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    return url
+
+sync_pool_stats = PoolStats("sync")
+async_pool_stats = PoolStats("async")
+
+# Sync engine: background workers, billing jobs and bootstrap
+_sync_url = make_url(settings.patched_database_url)
+engine = create_engine(_sync_url, **engine_options(_sync_url, False, sync_pool_stats))
+instrument(engine, sync_pool_stats)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine: request handlers, so DB waits never hold a threadpool slot or block the loop
+_async_url = async_database_url(settings.patched_database_url)
+async_engine = create_async_engine(_async_url, **engine_options(_async_url, True, async_pool_stats))
+instrument(async_engine.sync_engine, async_pool_stats)
+# Attributes stay loaded after commit: a lazy refresh would need I/O outside an await
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+def pool_metrics() -> Dict[str, Any]:
+    return {
+        "profile": settings.db_profile,
+        "sync": sync_pool_stats.snapshot(),
+        "async": async_pool_stats.snapshot(),
+    }
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
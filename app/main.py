@@ -1,35 +1,50 @@
 from fastapi import FastAPI, Depends, HTTPException, status, Request, Query, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse, FileResponse, JSONResponse
+from fastapi.responses import RedirectResponse, JSONResponse, StreamingResponse
 from fastapi.routing import APIRouter
 from contextlib import asynccontextmanager
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
+from sqlalchemy import select, tuple_, func
+import base64
+import json
 import os
 import logging
+import random
+import secrets
+import time
 from typing import Optional, List
 from starlette.middleware.sessions import SessionMiddleware
+from starlette.concurrency import run_in_threadpool
 
 # App imports
-from app.database import get_db, engine
+from app.database import get_async_db, engine, async_engine, AsyncSessionLocal, pool_metrics
 from app import models
-from app.auth.security import get_current_user, create_access_token, oauth2_scheme
-from app.auth.google_oauth import oauth
+from app.auth.security import get_current_user, authenticate_token, create_access_token, oauth2_scheme
+from app.auth.google_oauth import get_oauth
 from app.models.user import User
 from app.models.image import Image
 from app.services.cloudinary_service import cloudinary_service
-from app.services.redis_service import redis_service
-from app.billing.scheduler import start_scheduler
+from app.services.async_redis import async_redis
+from app.services.transform_jobs import derived_url, build_job, enqueue_transformation_async
+from app.services.events import publish_user_event_async, stream_user_events, image_payload, job_payload, issue_stream_ticket, redeem_stream_ticket, TICKET_TTL_SECONDS
+from app.services.upload_stream import CappedUploadStream, UploadTooLarge
+from app.services.content_version import conditional_get, bump_content_version_async, account_etag_parts
+from app.services.static_assets import PrecompressedStaticFiles, html_pages, ASSETS_DIR
+from app.services.metrics import registry, current_request, RequestStats, REQUEST_SECONDS, REQUEST_DB_QUERIES, REQUEST_DB_SECONDS
+from app.services.health import readiness
+from app.services.profiling import profiles
+from app.services.rate_limit import rate_limit
+from app.services.user_cache import user_cache
 from app.billing.enforce import ensure_credits_or_admin
+from app.billing.ledger import record_entry
 from app.billing.plans import PLANS, FREE_PLAN_ID
-from app.billing.resets import apply_monthly_reset, handle_expiration
+from app.billing.resets import apply_due_billing, is_billing_due
 from app.billing.assigns import assign_paid_plan, revert_to_free
-from app.billing.timeutils import now_utc
-from app.models.schemas import UserOut, ImageOut
+from app.billing.timeutils import as_utc, now_utc, start_of_next_utc_month
+from app.models.schemas import UserOut, ImageOut, TransformJobOut, UploadSignatureOut, UploadFinalizeIn
 from app.config import settings
-import cloudinary.uploader
-models.Base.metadata.create_all(bind=engine)
 # Setup Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("ssnapify")
@@ -37,21 +52,29 @@ logger = logging.getLogger("ssnapify")
 # ------- Lifespan --------
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Nothing here may block on the network: serverless instances run this on every
+    # cold start. Tables are created by `python -m app.bootstrap`, Redis and
+    # Cloudinary connect on first use.
     logger.info("🚀 SSnapify starting up...")
-    from app import models
-    models.Base.metadata.create_all(bind=engine)
-    logger.info("✅ Database tables created")
-    if redis_service.ping():
-        logger.info("✅ Redis connected successfully")
+    if settings.create_tables_on_startup:
+        models.Base.metadata.create_all(bind=engine)
+        logger.info("✅ Database tables created")
+    if settings.billing_scheduler_in_web:
+        try:
+            from app.billing.scheduler import start_scheduler  # APScheduler is only imported when used
+            start_scheduler()
+            logger.info("✅ Background billing scheduler started")
+        except Exception as e:
+            logger.error(f"Failed to start billing scheduler: {e}")
     else:
-        logger.warning("⚠️ Redis connection failed. Token blacklisting will not work.")
-    try:
-        start_scheduler()
-        logger.info("✅ Background billing scheduler started")
-    except Exception as e:
-        logger.error(f"Failed to start billing scheduler: {e}")
+        logger.info("Billing scheduler disabled in web process; run `python -m app.billing.worker`")
     yield
     logger.info("🛑 SSnapify shutting down...")
+    cloudinary_service.shutdown()
+    await async_redis.close()
+    # Close pooled connections (aiosqlite's worker threads would otherwise keep the process alive)
+    await async_engine.dispose()
+    engine.dispose()
 
 app = FastAPI(
     title="SSnapify API",
@@ -95,12 +118,76 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "DELETE", "PUT"],
     allow_headers=["Authorization", "Content-Type"],
+    expose_headers=["X-Next-Cursor", "X-Image-Counts", "X-Profile-Id", "RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "RateLimit-Policy", "Retry-After"],
 )
 
+# Multipart framing around the file part; anything beyond this plus the cap is rejected
+UPLOAD_FORM_OVERHEAD = 64 * 1024
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    # Refuse declared-oversized bodies before Starlette spools them to disk
+    if request.method == "POST" and request.url.path == "/images/":
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > settings.max_upload_bytes + UPLOAD_FORM_OVERHEAD:
+            return JSONResponse(status_code=413, content={"detail": str(UploadTooLarge(settings.max_upload_bytes))})
+    return await call_next(request)
+
+async def is_admin_request(request: Request) -> bool:
+    """Whether the bearer token belongs to an admin; middleware runs before route dependencies"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        async with AsyncSessionLocal() as db:
+            return (await authenticate_token(db, token)).is_admin
+    except HTTPException:
+        return False
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    # Admins opt a request in with the profiling header; a sample of other traffic is profiled too
+    stats = current_request.get()
+    requested = request.headers.get(settings.profiling_header, "").lower() in ("1", "true", "yes")
+    sampled = not requested and random.random() < settings.profiling_sample_rate and not request.url.path.startswith("/health")
+    if stats is None or not (sampled or (requested and await is_admin_request(request))):
+        return await call_next(request)
+    profile = profiles.begin(stats, requested)
+    if profile is None:
+        return await call_next(request)
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        report = await profiles.finish(profile, status_code)
+    response.headers["X-Profile-Id"] = report["id"]
+    return response
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    stats = RequestStats(scope=request.scope)
+    token = current_request.set(stats)
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        current_request.reset(token)
+        # Label by route template (/images/{image_id}), never the raw path, to keep series bounded
+        route = stats.route
+        REQUEST_SECONDS.observe(time.perf_counter() - started, request.method, route, status_code)
+        REQUEST_DB_QUERIES.observe(stats.db_queries, route)
+        REQUEST_DB_SECONDS.observe(stats.db_seconds, route)
+
 # Static Files (for local/dev - for Vercel you may want CDN or public static folder)
 app.mount("/static", StaticFiles(directory="public"), name="static")
 app.mount("/styles", StaticFiles(directory="public/styles"), name="styles")
 app.mount("/js", StaticFiles(directory="public/js"), name="js")
+# Fingerprinted, precompressed copies from `python -m app.services.static_assets`
+app.mount("/assets", PrecompressedStaticFiles(directory=ASSETS_DIR, check_dir=False), name="assets")
 
 # ------- Routers --------
 auth_router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -115,17 +202,17 @@ health_router = APIRouter(prefix="/health", tags=["Health"])
 async def google_login(request: Request):
     # Google OAuth login
     redirect_uri = request.url_for("google_callback")
-    return await oauth.google.authorize_redirect(request, redirect_uri)
+    return await get_oauth().google.authorize_redirect(request, redirect_uri)
 
 @auth_router.get("/google/callback")
-async def google_callback(request: Request, db: Session = Depends(get_db)):
+async def google_callback(request: Request, db: AsyncSession = Depends(get_async_db)):
     # Handle Google OAuth callback
     try:
-        token = await oauth.google.authorize_access_token(request)
+        token = await get_oauth().google.authorize_access_token(request)
         user_info = token.get("userinfo")
         if not user_info:
             raise HTTPException(status_code=400, detail="Failed to get user info from Google")
-        user = db.query(User).filter(User.email == user_info["email"]).first()
+        user = (await db.execute(select(User).where(User.email == user_info["email"]))).scalars().first()
         if not user:
             user = User(
                 email=user_info["email"],
@@ -136,25 +223,26 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
                 plan_id=FREE_PLAN_ID,
                 credit_balance=PLANS[FREE_PLAN_ID].monthly_credits,
                 last_credit_reset_at=now_utc(),
+                next_credit_reset_at=start_of_next_utc_month(now_utc()),
             )
-            db.add(user); db.commit(); db.refresh(user)
+            db.add(user); await db.flush()
+            record_entry(db, user.id, user.credit_balance, user.credit_balance, "signup_grant")
+            await db.commit(); await db.refresh(user)
         else:
-            changed = False
-            current_utc = now_utc()
-            if handle_expiration(user, current_utc): changed = True
-            if apply_monthly_reset(user, current_utc): changed = True
-            if changed: db.commit()
+            if await db.run_sync(lambda _: apply_due_billing(user, now_utc())):
+                await db.commit()
+                await bump_content_version_async(user.id)
         access_token = create_access_token(data={"sub": str(user.id)})
-        redirect_url = f"/static/login.html?token={access_token}"
+        redirect_url = f"/login.html?token={access_token}"
         return RedirectResponse(url=redirect_url)
     except Exception as e:
         logger.error(f"Google callback error: {e}")
-        return RedirectResponse(url="/static/login.html?error=auth_failed")
+        return RedirectResponse(url="/login.html?error=auth_failed")
 
 @auth_router.post("/logout")
-def logout(current_user: User = Depends(get_current_user), token: str = Depends(oauth2_scheme)):
+async def logout(current_user: User = Depends(get_current_user), token: str = Depends(oauth2_scheme)):
     try:
-        success = redis_service.blacklist_token(token, settings.access_token_expire_minutes)
+        success = await async_redis.blacklist_token(token, settings.access_token_expire_minutes)
         if not success:
             return {
                 "ok": True,
@@ -175,9 +263,9 @@ def logout(current_user: User = Depends(get_current_user), token: str = Depends(
         }
 
 @auth_router.post("/logout-all-devices")
-def logout_all_devices(current_user: User = Depends(get_current_user)):
+async def logout_all_devices(current_user: User = Depends(get_current_user)):
     try:
-        success = redis_service.blacklist_all_user_tokens(str(current_user.id))
+        success = await async_redis.blacklist_all_user_tokens(str(current_user.id))
         if not success:
             raise HTTPException(status_code=500, detail="Failed to logout from all devices")
         return {"ok": True, "message": "Successfully logged out from all devices", "user_id": current_user.id}
@@ -186,22 +274,25 @@ def logout_all_devices(current_user: User = Depends(get_current_user)):
         raise HTTPException(status_code=500, detail="Failed to logout from all devices")
 
 @app.get("/users/me", response_model=UserOut)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    not_modified = await conditional_get(request, response, current_user.id, *account_etag_parts(current_user))
+    if not_modified:
+        return not_modified
     return current_user
 
 @app.get("/users", response_model=List[UserOut])
-def get_all_users(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_all_users(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin access required")
-    return db.query(User).all()
+    return (await db.execute(select(User))).scalars().all()
 
 # ----- Image routes -----
-@images_router.post("/", response_model=ImageOut)
+@images_router.post("/", response_model=ImageOut, dependencies=[Depends(rate_limit("upload"))])
 async def upload_image(
     file: UploadFile = File(...),
     title: str = Form(""),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     try:
         logger.info(f"Upload Request - User: {current_user.email}, File: {file.filename}, Content-Type: {file.content_type}, Title: '{title}'")
@@ -209,152 +300,351 @@ async def upload_image(
             raise HTTPException(status_code=400, detail="No file provided")
         if not file.content_type or not file.content_type.startswith("image/"):
             raise HTTPException(status_code=400, detail=f"File must be an image. Received: {file.content_type}")
-        file_content = await file.read()
-        if len(file_content) == 0:
+        # Forward the spooled file in bounded chunks instead of reading it into memory
+        stream = CappedUploadStream(file.file, settings.max_upload_bytes, name=file.filename, declared_type=file.content_type)
+        # A local pass over the spooled file enforces the cap and hashes it before any network I/O
+        content_hash = await run_in_threadpool(stream.hash_contents)
+        if stream.length == 0:
             raise HTTPException(status_code=400, detail="Uploaded file is empty")
-        upload_result = cloudinary.uploader.upload(
-            file_content,
-            public_id=f"user_{current_user.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            folder="ssnapify/originals",
-            resource_type="image",
-        )
-        logger.info(f"Cloudinary upload successful: {upload_result['public_id']}")
+        duplicate = (await db.execute(
+            select(Image.public_id, Image.secure_url)
+            .where(
+                Image.user_id == current_user.id,
+                Image.content_hash == content_hash,
+                Image.transformation_type.is_(None),
+            )
+            .limit(1)
+        )).first()
+        if duplicate:
+            # Same bytes already on Cloudinary for this user: reuse the asset
+            public_id, secure_url = duplicate
+            logger.info(f"Duplicate upload reused: {public_id}")
+        else:
+            upload_result = await cloudinary_service.upload_stream_async(
+                stream,
+                public_id=f"user_{current_user.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                folder="ssnapify/originals",
+            )
+            public_id, secure_url = upload_result["public_id"], upload_result["secure_url"]
+            logger.info(f"Cloudinary upload successful: {public_id} ({stream.length} bytes, {stream.content_type})")
         image = Image(
             user_id=current_user.id,
-            public_id=upload_result["public_id"],
-            secure_url=upload_result["secure_url"],
+            public_id=public_id,
+            secure_url=secure_url,
+            content_hash=content_hash,
             title=title or file.filename or "Untitled",
             transformation_type=None,
             config=None,
         )
-        db.add(image); db.commit(); db.refresh(image)
+        db.add(image); await db.commit(); await db.refresh(image)
+        await bump_content_version_async(current_user.id)
         logger.info(f"Database save successful: Image ID {image.id}")
+        await publish_user_event_async(current_user.id, "upload", image_payload(image))
         return image
     except HTTPException:
         raise
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         logger.error(f"Upload error: {type(e).__name__}: {e}")
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
+# Formats accepted for direct uploads, matching SUPPORTED_FORMATS in public/js/config.js
+DIRECT_UPLOAD_FORMATS = "jpg,png,gif,webp"
+
+def user_upload_folder(user: User) -> str:
+    return f"ssnapify/originals/user_{user.id}"
+
+@images_router.post("/upload-signature", response_model=UploadSignatureOut, dependencies=[Depends(rate_limit("upload"))])
+def create_upload_signature(current_user: User = Depends(get_current_user)):
+    """Signed parameters for uploading straight from the browser to Cloudinary, scoped to the user's folder"""
+    return cloudinary_service.sign_upload(user_upload_folder(current_user), allowed_formats=DIRECT_UPLOAD_FORMATS)
+
+async def discard_direct_upload(public_id: str):
+    # Best effort: a leftover asset only costs storage
+    try:
+        await cloudinary_service.destroy_image_async(public_id)
+    except Exception as e:
+        logger.warning(f"Could not delete rejected direct upload {public_id}: {e}")
+
+@images_router.post("/finalize", response_model=ImageOut)
+async def finalize_upload(
+    payload: UploadFinalizeIn,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Record a direct upload after checking Cloudinary's response signature and the
+    folder scope, then apply the same size cap and dedup as POST /images/.
+    """
+    if not cloudinary_service.verify_upload(payload.public_id, payload.version, payload.signature):
+        raise HTTPException(status_code=400, detail="Invalid upload signature")
+    if not payload.public_id.startswith(user_upload_folder(current_user) + "/"):
+        raise HTTPException(status_code=403, detail="Upload is outside your folder")
+    existing = (await db.execute(
+        select(Image).where(Image.user_id == current_user.id, Image.public_id == payload.public_id)
+    )).scalars().first()
+    if existing:
+        return existing  # finalize retried; stay idempotent
+    # The signature covers only public_id and version; size and checksum come from Cloudinary
+    try:
+        resource = await cloudinary_service.get_image_info_async(payload.public_id)
+    except Exception as e:
+        logger.error(f"Direct upload lookup failed: {e}")
+        raise HTTPException(status_code=502, detail="Could not verify the upload with Cloudinary")
+    if resource.get("bytes", 0) > settings.max_upload_bytes:
+        await discard_direct_upload(payload.public_id)
+        raise HTTPException(status_code=413, detail=str(UploadTooLarge(settings.max_upload_bytes)))
+    # Cloudinary's etag is the MD5 of the stored file; prefixed so it never meets a server-side SHA-256
+    content_hash = f"md5:{resource['etag']}" if resource.get("etag") else None
+    duplicate = content_hash and (await db.execute(
+        select(Image.public_id, Image.secure_url)
+        .where(
+            Image.user_id == current_user.id,
+            Image.content_hash == content_hash,
+            Image.transformation_type.is_(None),
+        )
+        .limit(1)
+    )).first()
+    if duplicate:
+        # Same bytes already stored for this user: keep that asset, drop the new copy
+        public_id, secure_url = duplicate
+        await discard_direct_upload(payload.public_id)
+        logger.info(f"Duplicate direct upload reused: {public_id}")
+    else:
+        public_id = payload.public_id
+        secure_url = cloudinary_service.delivery_url(payload.public_id, payload.version, payload.format)
+    image = Image(
+        user_id=current_user.id,
+        public_id=public_id,
+        secure_url=secure_url,
+        content_hash=content_hash,
+        title=payload.title or payload.public_id.rsplit("/", 1)[-1],
+        transformation_type=None,
+        config=None,
+    )
+    db.add(image); await db.commit(); await db.refresh(image)
+    await bump_content_version_async(current_user.id)
+    logger.info(f"Direct upload finalized: Image ID {image.id}")
+    await publish_user_event_async(current_user.id, "upload", image_payload(image))
+    return image
+
+def encode_image_cursor(image: Image) -> str:
+    raw = json.dumps([image.created_at.isoformat(), image.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_image_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, image_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(image_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def comparable_timestamp(value):
+    """
+    A created_at column or cursor value in a form that compares correctly. SQLite
+    keeps timestamps as text, where CURRENT_TIMESTAMP's '... 02:07:16' sorts before
+    the bound '... 02:07:16.000000' of the same instant; compare julianday() there.
+    """
+    return func.julianday(value) if async_engine.dialect.name == "sqlite" else value
+
+# transformation_type filter values that select untransformed uploads
+ORIGINAL_FILTER_VALUES = {"original", "null", ""}
+
 @images_router.get("/", response_model=List[ImageOut])
-def get_user_images(
+async def get_user_images(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-    skip: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+    cursor: Optional[str] = Query(None, description="Opaque X-Next-Cursor value from the previous page"),
+    skip: int = Query(0, ge=0, description="Offset pagination; slow for deep pages, prefer cursor"),
     limit: int = Query(100, ge=1, le=100),
     from_date: Optional[str] = Query(None),
     to_date: Optional[str] = Query(None),
+    transformation_type: Optional[str] = Query(None, description="A transformation name, or 'original' for uploads only"),
+    include_counts: bool = Query(False, description="Return per-type totals in the X-Image-Counts header"),
 ):
-    query = db.query(Image).filter(Image.user_id == current_user.id)
+    """
+    List the user's images newest first. Each full page carries an X-Next-Cursor
+    header; passing it back seeks on (created_at, id) through ix_images_user_created_id,
+    so page latency does not grow with gallery depth. skip is still honoured when no
+    cursor is given, but costs a scan over every skipped row.
+    """
+    not_modified = await conditional_get(request, response, current_user.id)
+    if not_modified:
+        return not_modified
+    conditions = [Image.user_id == current_user.id]
     if from_date:
         try:
             from_datetime = datetime.fromisoformat(from_date)
-            query = query.filter(Image.created_at >= from_datetime)
+            conditions.append(Image.created_at >= from_datetime)
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid from_date format")
     if to_date:
         try:
             to_datetime = datetime.fromisoformat(to_date)
-            query = query.filter(Image.created_at <= to_datetime)
+            conditions.append(Image.created_at <= to_datetime)
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid to_date format")
-    return query.order_by(Image.created_at.desc()).offset(skip).limit(limit).all()
+    if include_counts:
+        # One grouped, index-only pass; keys are transformation names plus "original"
+        counts = (await db.execute(
+            select(Image.transformation_type, func.count(Image.id))
+            .where(*conditions)
+            .group_by(Image.transformation_type)
+        )).all()
+        response.headers["X-Image-Counts"] = json.dumps({(t or "original"): n for t, n in counts})
+    if transformation_type is not None:
+        if transformation_type in ORIGINAL_FILTER_VALUES:
+            conditions.append(Image.transformation_type.is_(None))
+        else:
+            conditions.append(Image.transformation_type == transformation_type)
+    created_at = comparable_timestamp(Image.created_at)
+    query = select(Image).where(*conditions).order_by(created_at.desc(), Image.id.desc())
+    if cursor:
+        cursor_at, cursor_id = decode_image_cursor(cursor)
+        query = query.where(tuple_(created_at, Image.id) < tuple_(comparable_timestamp(cursor_at), cursor_id))
+    elif skip:
+        query = query.offset(skip)
+    images = (await db.execute(query.limit(limit))).scalars().all()
+    if len(images) == limit:
+        response.headers["X-Next-Cursor"] = encode_image_cursor(images[-1])
+    return images
+
+@images_router.post("/events/ticket")
+async def image_events_ticket(current_user: User = Depends(get_current_user)):
+    """Single-use ticket for GET /images/events, which EventSource opens without an Authorization header"""
+    ticket = await issue_stream_ticket(current_user.id)
+    if ticket is None:
+        raise HTTPException(status_code=503, detail="Live updates unavailable")
+    return {"ticket": ticket, "expires_in": TICKET_TTL_SECONDS}
+
+@images_router.get("/events")
+async def image_events(ticket: str = Query(..., description="Single-use ticket from POST /images/events/ticket")):
+    """
+    Server-Sent Events stream of the user's upload and transformation job updates,
+    fanned out through Redis pub/sub so any worker can serve it.
+    """
+    if not async_redis.available:
+        raise HTTPException(status_code=503, detail="Live updates unavailable")
+    # Authenticated once per connection, without holding a DB session for the stream's lifetime
+    user_id = await redeem_stream_ticket(ticket)
+    if user_id is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired ticket")
+    return StreamingResponse(
+        stream_user_events(user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def find_user_image(db: AsyncSession, user: User, image_id: int) -> Optional[Image]:
+    return (await db.execute(
+        select(Image).where(Image.id == image_id, Image.user_id == user.id)
+    )).scalars().first()
 
 @images_router.get("/{image_id}", response_model=ImageOut)
-def get_image(
+async def get_image(
     image_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    image = db.query(Image).filter(Image.id == image_id, Image.user_id == current_user.id).first()
+    not_modified = await conditional_get(request, response, current_user.id)
+    if not_modified:
+        return not_modified
+    image = await find_user_image(db, current_user, image_id)
     if not image:
         raise HTTPException(status_code=404, detail="Image not found")
     return image
 
 @images_router.delete("/{image_id}")
-def delete_image(
+async def delete_image(
     image_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    image = db.query(Image).filter(Image.id == image_id, Image.user_id == current_user.id).first()
+    image = await find_user_image(db, current_user, image_id)
     if not image:
         raise HTTPException(status_code=404, detail="Image not found")
+    # Deduplicated uploads share one Cloudinary asset; only the last row removes it
+    shared = (await db.execute(
+        select(Image.id)
+        .where(Image.user_id == current_user.id, Image.public_id == image.public_id, Image.id != image.id)
+        .limit(1)
+    )).first()
     try:
-        import cloudinary.uploader
-        cloudinary.uploader.destroy(image.public_id)
-        db.delete(image); db.commit()
+        if not shared:
+            await cloudinary_service.destroy_image_async(image.public_id)
+        await db.delete(image); await db.commit()
+        await bump_content_version_async(current_user.id)
         return {"message": "Image deleted successfully"}
     except Exception as e:
         logger.error(f"Delete error: {e}")
         raise HTTPException(status_code=500, detail="Failed to delete image")
 
 # --------- Transformations ---------
-@images_router.post("/{image_id}/restore")
-async def restore_image(image_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@images_router.post("/{image_id}/restore", response_model=TransformJobOut, status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(rate_limit("transform"))])
+async def restore_image(image_id: int, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     return await apply_transformation(image_id, "restore", current_user, db, cost=1)
 
-@images_router.post("/{image_id}/remove_bg")
-async def remove_background(image_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@images_router.post("/{image_id}/remove_bg", response_model=TransformJobOut, status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(rate_limit("transform"))])
+async def remove_background(image_id: int, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     return await apply_transformation(image_id, "remove_bg", current_user, db, cost=1)
 
-@images_router.post("/{image_id}/remove_obj")
-async def remove_object(image_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@images_router.post("/{image_id}/remove_obj", response_model=TransformJobOut, status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(rate_limit("transform"))])
+async def remove_object(image_id: int, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     return await apply_transformation(image_id, "remove_obj", current_user, db, cost=1)
 
-@images_router.post("/{image_id}/enhance")
-async def enhance_image(image_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@images_router.post("/{image_id}/enhance", response_model=TransformJobOut, status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(rate_limit("transform"))])
+async def enhance_image(image_id: int, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     return await apply_transformation(image_id, "enhance", current_user, db, cost=1)
 
-@images_router.post("/{image_id}/generative_fill")
+@images_router.post("/{image_id}/generative_fill", response_model=TransformJobOut, status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(rate_limit("transform"))])
 async def generative_fill(
     image_id: int,
     prompt: str = Query(..., description="Description for generative fill"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     return await apply_transformation(image_id, "generative_fill", current_user, db, cost=3, prompt=prompt)
 
-@images_router.post("/{image_id}/replace_bg")
+@images_router.post("/{image_id}/replace_bg", response_model=TransformJobOut, status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(rate_limit("transform"))])
 async def replace_background(
     image_id: int,
     prompt: str = Query(..., description="Description for new background"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     return await apply_transformation(image_id, "replace_bg", current_user, db, cost=2, prompt=prompt)
 
+def transform_job_out(image: Image) -> dict:
+    return {"job_id": image.id, "status": image.status, "error": image.error, "image": image}
+
 async def apply_transformation(
     image_id: int,
     transformation: str,
     current_user: User,
-    db: Session,
+    db: AsyncSession,
     cost: int,
     prompt: str = None,
 ):
-    image = db.query(Image).filter(Image.id == image_id, Image.user_id == current_user.id).first()
+    """
+    Debit credits and create the derived image in one commit. With
+    TRANSFORM_WORKER_ENABLED it starts as a pending job for the transformation
+    workers and clients follow GET /images/jobs/{job_id}; otherwise (no worker
+    runs on Vercel) it is ready at once and Cloudinary renders it on first fetch.
+    """
+    image = await find_user_image(db, current_user, image_id)
     if not image:
         raise HTTPException(status_code=404, detail="Image not found")
-    ensure_credits_or_admin(current_user, db, cost)
+    # Debit and the derived image row share one transaction: a single commit,
+    # and any failure below rolls both back instead of issuing a refund.
     try:
-        logger.info(f"Applying transformation: {transformation} for user {current_user.id}")
-        base_url = image.secure_url
-        url_parts = base_url.split("/upload/")
-        if len(url_parts) != 2:
-            raise Exception("Invalid Cloudinary URL format")
-        base_part = url_parts[0] + "/upload/"
-        image_part = url_parts[1]
-        transformation_map = {
-            "restore": "e_improve",
-            "remove_bg": "e_background_removal",
-            "remove_obj": "e_gen_remove",
-            "enhance": "e_auto_contrast,e_auto_brightness",
-            "generative_fill": "e_gen_fill",
-            "replace_bg": "e_gen_background_replace",
-        }
-        transformation_params = transformation_map.get(transformation, "")
-        transformed_url = f"{base_part}{transformation_params}/{image_part}"
-        logger.info(f"Transformation URL: {transformed_url}")
+        logger.info(f"Queueing transformation: {transformation} for user {current_user.id}")
+        transformed_url = derived_url(image.secure_url, transformation)
         new_image = Image(
             user_id=current_user.id,
             public_id=f"transformed_{transformation}_{image.public_id.replace('/', '_')}",
@@ -362,48 +652,65 @@ async def apply_transformation(
             title=f"{transformation.replace('_', ' ').title()} - {image.title}",
             transformation_type=transformation,
             config={"original_image_id": image.id, "prompt": prompt} if prompt else {"original_image_id": image.id},
+            status="pending" if settings.transform_worker_enabled else "ready",
         )
-        db.add(new_image); db.commit(); db.refresh(new_image)
-        logger.info(f"Transformation complete: Image ID {new_image.id}")
-        return new_image
+        db.add(new_image); await db.flush()
+        # Flushed first so the append-only ledger row is written once, with its image_id
+        debit = await db.run_sync(lambda session: ensure_credits_or_admin(current_user, session, cost, transformation, new_image.id))
+        await db.commit(); await db.refresh(new_image)
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as e:
         logger.error(f"Transformation error: {e}")
-        current_user.credit_balance += cost
-        db.commit()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Transformation failed: {str(e)}")
 
+    if new_image.status == "pending" and not await enqueue_transformation_async(build_job(new_image, image, cost if debit else 0)):
+        # Queue unreachable: fall back to Cloudinary's lazy on-first-fetch rendering
+        new_image.status = "ready"
+        await db.commit()
+    # Covers the new image and the debit
+    await bump_content_version_async(current_user.id)
+    await publish_user_event_async(current_user.id, "job", job_payload(new_image))
+    logger.info(f"Transformation job {new_image.id} {new_image.status}")
+    return transform_job_out(new_image)
+
+@images_router.get("/jobs/{job_id}", response_model=TransformJobOut)
+async def get_transformation_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    image = await find_user_image(db, current_user, job_id)
+    if not image or image.transformation_type is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return transform_job_out(image)
+
 # ------------ Account, Admin, Support, and Health routes omitted for brevity (you already have these, keep as is) ------------
 @account_router.get("/credits")
-def get_user_credits(
+async def get_user_credits(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get user's credit information with reset logic applied.
     """
-    # Apply pending account resets/expirations, if any
     current_utc = now_utc()
-    changed = False
-    if handle_expiration(current_user, current_utc):
-        changed = True
-    if apply_monthly_reset(current_user, current_utc):
-        changed = True
-    if changed:
-        db.commit()
-
-    plan_spec = PLANS.get(current_user.plan_id, PLANS[FREE_PLAN_ID])
-    days_until_reset = 30
-    if current_user.billing_anchor_utc and current_user.plan_id != FREE_PLAN_ID:
-        from app.billing.resets import compute_paid_cycle_start
-        from app.billing.timeutils import add_calendar_months
-        cycle_start = compute_paid_cycle_start(current_user.billing_anchor_utc, current_utc)
-        next_cycle = add_calendar_months(cycle_start, 1)
-        days_until_reset = (next_cycle - current_utc).days
-    else:
-        from app.billing.timeutils import start_of_utc_month, add_calendar_months
-        current_month_start = start_of_utc_month(current_utc)
-        next_month_start = add_calendar_months(current_month_start, 1)
-        days_until_reset = (next_month_start - current_utc).days
+    if not is_billing_due(current_user, current_utc):
+        # days_until_next_reset changes with the clock, not the content version
+        days_left = (as_utc(current_user.next_credit_reset_at) - current_utc).days
+        not_modified = await conditional_get(request, response, current_user.id, days_left, *account_etag_parts(current_user))
+        if not_modified:
+            return not_modified
+    # Apply pending account resets/expirations, if any
+    if await db.run_sync(lambda _: apply_due_billing(current_user, current_utc)):
+        await db.commit()
+        await bump_content_version_async(current_user.id)
+
+    days_until_reset = (as_utc(current_user.next_credit_reset_at) - current_utc).days
 
     return {
         "credit_balance": current_user.credit_balance,
@@ -414,17 +721,80 @@ def get_user_credits(
         "billing_cycle_ends": getattr(current_user, "plan_expires_at", None),
     }
 
+@admin_router.get("/profiles")
+async def list_profiles(current_user: User = Depends(get_current_user)):
+    """Recent request profiles taken by this instance, newest first"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return profiles.recent()
+
+@admin_router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, format: str = Query("json", pattern="^(json|collapsed)$"), current_user: User = Depends(get_current_user)):
+    """A request profile by the id from its X-Profile-Id header; format=collapsed gives flamegraph input"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    report = await profiles.get(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profile not found or expired")
+    if format == "collapsed":
+        return Response("".join(f"{s['stack']} {s['samples']}\n" for s in report["profile"]["stacks"]), media_type="text/plain")
+    return report
+
+async def require_metrics_access(request: Request):
+    """Admins, or a scraper presenting METRICS_TOKEN as its bearer token; internals stay private otherwise"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if settings.metrics_token and scheme.lower() == "bearer" and secrets.compare_digest(token, settings.metrics_token):
+        return
+    if not await is_admin_request(request):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+@health_router.get("/db", dependencies=[Depends(require_metrics_access)])
+def database_pool_health():
+    """Connection pool occupancy, checkout wait and churn for the sync and async engines"""
+    return pool_metrics()
+
+def _numeric(snapshot: dict, **labels):
+    for stat, value in snapshot.items():
+        if isinstance(value, (int, float)):
+            yield {**labels, "stat": stat}, value
+
+registry.gauge("ssnapify_db_pool", "Connection pool counters and occupancy per engine", lambda: [
+    sample for name in ("sync", "async") for sample in _numeric(pool_metrics()[name], engine=name)
+])
+registry.gauge("ssnapify_redis", "asyncio Redis command counters, pool occupancy and breaker state", lambda: _numeric(
+    {**async_redis.metrics(), "breaker_open": int(async_redis.breaker.state == async_redis.breaker.OPEN)}
+))
+registry.gauge("ssnapify_cloudinary_executor", "Cloudinary executor load and queue depth", lambda: _numeric(cloudinary_service.metrics()))
+registry.gauge("ssnapify_user_cache", "Principal cache size and hit counters", lambda: _numeric(user_cache.metrics()))
+
+@health_router.get("/metrics", dependencies=[Depends(require_metrics_access)])
+def prometheus_metrics():
+    """Process metrics in the Prometheus text exposition format"""
+    return Response(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@health_router.get("/live")
+def liveness():
+    """The process is serving requests; never touches dependencies"""
+    return {"status": "alive"}
+
+@health_router.get("/ready")
+async def readiness_probe():
+    """DB and Redis reachability from cached checks; 503 when the app cannot serve traffic"""
+    result = await readiness()
+    return JSONResponse(result, status_code=503 if result["status"] == "not_ready" else 200)
+
 # --------- Static and Error Handling ---------
 @app.get("/")
 def root():
-    return RedirectResponse(url="/static/index.html")
+    return RedirectResponse(url="/index.html")
 
 @app.get("/{filename}")
-def serve_html_pages(filename: str):
+def serve_html_pages(filename: str, request: Request):
     if filename.endswith(".html"):
-        file_path = f"public/{filename}"
-        if os.path.exists(file_path):
-            return FileResponse(file_path)
+        # Served from memory, already compressed, revalidated by ETag
+        page = html_pages.response(filename, request.headers)
+        if page:
+            return page
         raise HTTPException(status_code=404, detail="Page not found")
 
 @app.get("/test-session")
@@ -447,13 +817,13 @@ app.include_router(health_router)
 # ----------- Custom Error Handlers -----------
 @app.exception_handler(404)
 async def custom_404_handler(request: Request, exc):
-    try:
-        return FileResponse("public/404.html", status_code=404)
-    except FileNotFoundError:
-        return JSONResponse(
-            status_code=404,
-            content={"error": "Page not found", "detail": "The requested resource was not found"}
-        )
+    page = html_pages.response("404.html", request.headers, status_code=404)
+    if page:
+        return page
+    return JSONResponse(
+        status_code=404,
+        content={"error": "Page not found", "detail": "The requested resource was not found"}
+    )
 
 @app.exception_handler(500)
 async def custom_500_handler(request: Request, exc):
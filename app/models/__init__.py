@@ -2,5 +2,7 @@
 from .base import Base
 from .user import User  
 from .image import Image
+from .credit_ledger import CreditLedger
+from .job_run import JobRun
 
-__all__ = ['Base', 'User', 'Image']
+__all__ = ['Base', 'User', 'Image', 'CreditLedger', 'JobRun']
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.models.base import Base  # Import from base.py
+
+class CreditLedger(Base):
+    """Append-only record of every credit balance change; SUM(delta) per user is the balance"""
+    __tablename__ = "credit_ledger"
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    delta = Column(Integer, nullable=False)  # negative for debits
+    balance_after = Column(Integer, nullable=False)
+    reason = Column(String, nullable=False)  # e.g., 'debit', 'refund', 'monthly_reset'
+    transformation_type = Column(String, nullable=True)
+    image_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from app.models.base import Base  # Import from base.py
 
@@ -8,7 +8,18 @@ class Image(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     public_id = Column(String, nullable=False)  # Cloudinary ID
     secure_url = Column(String, nullable=False)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of uploaded bytes (md5:<etag> for direct uploads), for dedup
     title = Column(String, nullable=True)
     transformation_type = Column(String, nullable=True)  # e.g., 'restore', 'remove_bg'
     config = Column(JSON, nullable=True)  # Parameters/config.
+    status = Column(String, nullable=False, default="ready", server_default="ready")  # 'pending', 'processing', 'ready', 'failed'
+    error = Column(String, nullable=True)  # why a transformation job failed
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Serves the gallery listing and its keyset cursor: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_images_user_created_id", "user_id", created_at.desc(), id.desc()),
+        # Filtered gallery views and the per-type counts that accompany them
+        Index("ix_images_user_type_created", "user_id", "transformation_type", created_at.desc()),
+        Index("ix_images_user_content_hash", "user_id", "content_hash"),
+    )
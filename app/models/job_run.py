@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from app.models.base import Base  # Import from base.py
+
+class JobRun(Base):
+    """History of scheduled job executions; (job_name, run_key) claims a slot exactly once"""
+    __tablename__ = "job_runs"
+    id = Column(Integer, primary_key=True, index=True)
+    job_name = Column(String, nullable=False)
+    run_key = Column(String, nullable=False)  # e.g., '2025-01-31' for the daily reset
+    instance = Column(String, nullable=False)  # host:pid that ran it
+    status = Column(String, nullable=False, default="running")  # 'running', 'succeeded', 'failed'
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    duration_ms = Column(Integer, nullable=True)
+    detail = Column(JSON, nullable=True)  # job result or error
+
+    __table_args__ = (
+        UniqueConstraint("job_name", "run_key", name="uq_job_runs_job_run_key"),
+    )
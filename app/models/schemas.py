@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, computed_field
 from datetime import datetime
 from typing import Optional, Dict, Any, List
+from app.services.cloudinary_service import cloudinary_service
 
 class UserCreate(BaseModel):
     email: EmailStr
@@ -46,7 +47,36 @@ class ImageOut(BaseModel):
     title: Optional[str]
     transformation_type: Optional[str]
     config: Optional[Dict[str, Any] | List[Dict[str, Any]]]
+    status: Optional[str] = "ready"
     created_at: datetime
 
+    @computed_field
+    @property
+    def variants(self) -> Dict[str, str]:
+        # thumb / medium / full renditions with f_auto,q_auto for srcset
+        return cloudinary_service.variant_urls(self.public_id, self.secure_url)
+
     class Config:
         from_attributes = True
+
+class UploadSignatureOut(BaseModel):
+    upload_url: str
+    api_key: str
+    timestamp: int
+    folder: str
+    allowed_formats: str
+    signature: str
+
+class UploadFinalizeIn(BaseModel):
+    # Fields echoed from Cloudinary's upload response
+    public_id: str
+    version: int
+    signature: str
+    format: Optional[str] = None
+    title: Optional[str] = None
+
+class TransformJobOut(BaseModel):
+    job_id: int             # id of the derived Image row the job fills in
+    status: str
+    error: Optional[str] = None
+    image: ImageOut
@@ -14,6 +14,7 @@ class User(Base):
     plan_expires_at = Column(DateTime(timezone=True), nullable=True)
     billing_anchor_utc = Column(DateTime(timezone=True), nullable=True)
     last_credit_reset_at = Column(DateTime(timezone=True), nullable=True)
+    next_credit_reset_at = Column(DateTime(timezone=True), nullable=True, index=True)  # next expiry/reset boundary
     is_active = Column(Boolean, default=True)
     is_admin = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,279 @@
+# app/services/async_redis.py
+
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+import redis.asyncio as aioredis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError, ResponseError, TimeoutError as RedisTimeoutError
+from app.config import settings
+from app.services.metrics import record_redis_call
+from app.services.redis_service import RedisService, fake_server, is_fake_url
+
+logger = logging.getLogger("ssnapify.redis")
+
+class AsyncCircuitBreaker:
+    """
+    Fails fast after repeated Redis errors. While open, a single caller is let
+    through as a reconnect probe, with exponential backoff between probes, so an
+    outage costs neither socket timeouts nor a background thread.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+
+    def __init__(self, failure_threshold: int, base_seconds: float, cap_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.base_seconds = base_seconds
+        self.cap_seconds = cap_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_count = 0
+        self.fast_failures = 0
+        self.reconnect_attempts = 0
+        self._backoff = base_seconds
+        self._probe_at = 0.0
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        if now >= self._probe_at:
+            # Claim the probe slot; concurrent callers keep failing fast until it resolves
+            self._probe_at = now + self._backoff
+            self._backoff = min(self._backoff * 2, self.cap_seconds)
+            self.reconnect_attempts += 1
+            return True
+        self.fast_failures += 1
+        return False
+
+    def record_success(self):
+        if self.state == self.OPEN:
+            logger.info("✅ Redis circuit closed")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._backoff = self.base_seconds
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_count += 1
+            self._probe_at = time.monotonic() + self._backoff
+            logger.warning(f"⚠️ Redis circuit opened after {self.consecutive_failures} failures")
+
+class AsyncRedisService:
+    """
+    asyncio Redis for request handlers. Every caller in the process shares one
+    bounded connection pool; connection errors are retried with exponential
+    backoff by redis-py, and the breaker above fails fast during outages. Like the
+    sync RedisService (still used by workers and jobs), every call fails open.
+    """
+    def __init__(self):
+        self._client: Optional[aioredis.Redis] = None
+        self._pubsub_client: Optional[aioredis.Redis] = None
+        self._configured = False
+        self._scripts: Dict[str, Any] = {}
+        self.scripting = True
+        self.breaker = AsyncCircuitBreaker(
+            failure_threshold=settings.redis_breaker_failure_threshold,
+            base_seconds=settings.redis_breaker_reset_seconds,
+            cap_seconds=settings.redis_reconnect_cap_seconds,
+        )
+        self.commands = 0
+        self.errors = 0
+        self.round_trips_saved = 0
+
+    def configure(self, url: Optional[str]):
+        """(Re)build the clients for url; fakeredis:// selects the shared in-memory test server"""
+        self._configured = True
+        self._client = self._pubsub_client = None
+        self._scripts, self.scripting = {}, True
+        if not url:
+            logger.warning("⚠️ No Redis URL provided")
+            return
+        if is_fake_url(url):
+            import fakeredis
+            self._client = self._pubsub_client = fakeredis.FakeAsyncRedis(server=fake_server(), decode_responses=True)
+            return
+        options = dict(
+            decode_responses=True,
+            socket_connect_timeout=settings.redis_socket_timeout,
+            retry=Retry(
+                ExponentialBackoff(cap=settings.redis_backoff_cap_seconds, base=settings.redis_backoff_base_seconds),
+                settings.redis_retry_attempts,
+            ),
+            retry_on_error=[RedisConnectionError, RedisTimeoutError],
+            health_check_interval=30,
+        )
+        # Callers wait up to redis_pool_timeout for a connection instead of opening unbounded ones
+        pool = aioredis.BlockingConnectionPool.from_url(
+            url,
+            max_connections=settings.redis_max_connections,
+            timeout=settings.redis_pool_timeout,
+            socket_timeout=settings.redis_socket_timeout,
+            **options,
+        )
+        self._client = aioredis.Redis(connection_pool=pool)
+        # SSE subscriptions hold a connection for as long as the stream is open,
+        # so they get their own pool rather than starving commands
+        self._pubsub_client = aioredis.from_url(url, **options)
+
+    @property
+    def client(self) -> Optional[aioredis.Redis]:
+        if not self._configured:
+            self.configure(os.getenv("REDIS_URL"))
+        return self._client
+
+    @property
+    def available(self) -> bool:
+        return self.client is not None and self.breaker.allow()
+
+    async def _call(self, label: str, default: Any, command: Callable[[aioredis.Redis], Awaitable[Any]]) -> Any:
+        if not self.available:
+            return default
+        started = time.perf_counter()
+        try:
+            result = await command(self._client)
+        except Exception as e:
+            record_redis_call(label, time.perf_counter() - started, failed=True)
+            self.errors += 1
+            self.breaker.record_failure()
+            logger.warning(f"Redis {label} error: {e}")
+            return default
+        record_redis_call(label, time.perf_counter() - started)
+        self.commands += 1
+        self.breaker.record_success()
+        return result
+
+    async def ping(self) -> bool:
+        return bool(await self._call("ping", False, lambda client: client.ping()))
+
+    async def close(self):
+        for client in {self._client, self._pubsub_client} - {None}:
+            await client.aclose()
+        self._configured = False
+        self._client = self._pubsub_client = None
+
+    def pubsub(self) -> Optional[aioredis.client.PubSub]:
+        if self.client is None:
+            return None
+        return self._pubsub_client.pubsub()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Command counters, breaker state and command pool occupancy"""
+        pool = self._client.connection_pool if self._client is not None else None
+        in_use = len(getattr(pool, "_in_use_connections", ()))
+        idle = sum(1 for c in getattr(pool, "_available_connections", ()) if c is not None)
+        return {
+            "connected": self._client is not None,
+            "commands": self.commands,
+            "errors": self.errors,
+            "round_trips_saved": self.round_trips_saved,
+            "pool_max_connections": getattr(pool, "max_connections", 0),
+            "pool_in_use": in_use,
+            "pool_idle": idle,
+            "breaker_state": self.breaker.state,
+            "breaker_consecutive_failures": self.breaker.consecutive_failures,
+            "breaker_opened_count": self.breaker.opened_count,
+            "breaker_fast_failures": self.breaker.fast_failures,
+            "reconnect_attempts": self.breaker.reconnect_attempts,
+        }
+
+    async def check_token_state(self, token: str, user_id: str) -> Tuple[bool, Optional[datetime]]:
+        """Blacklist and logout-all-devices lookups in one pipelined round trip"""
+        async def lookup(client):
+            pipe = client.pipeline(transaction=False)
+            pipe.get(f"blacklist:{token}")
+            pipe.get(f"user_logout:{user_id}")
+            return await pipe.execute()
+        result = await self._call("token state", None, lookup)
+        if result is None:
+            return False, None
+        self.round_trips_saved += 1
+        blacklisted, logout = result
+        return blacklisted is not None, RedisService._parse_logout_time(logout)
+
+    async def blacklist_token(self, token: str, expires_in_minutes: int = None) -> bool:
+        expiry_seconds = (expires_in_minutes or settings.access_token_expire_minutes) * 60
+        data = json.dumps({"blacklisted_at": datetime.now(timezone.utc).isoformat(), "reason": "user_logout"})
+        return bool(await self._call("blacklist", False, lambda client: client.setex(f"blacklist:{token}", expiry_seconds, data)))
+
+    async def blacklist_all_user_tokens(self, user_id: str) -> bool:
+        data = json.dumps({"logged_out_at": datetime.now(timezone.utc).isoformat(), "reason": "user_logout_all_devices"})
+        return bool(await self._call("user logout", False, lambda client: client.setex(f"user_logout:{user_id}", 24 * 60 * 60, data)))
+
+    async def get_json(self, key: str) -> Optional[Any]:
+        raw = await self._call("cache read", None, lambda client: client.get(key))
+        return json.loads(raw) if raw else None
+
+    async def pop_json(self, key: str) -> Optional[Any]:
+        """Read and delete in one step (GETDEL), for single-use values"""
+        raw = await self._call("cache pop", None, lambda client: client.getdel(key))
+        return json.loads(raw) if raw else None
+
+    async def set_json(self, key: str, value: Any, expiry_seconds: int) -> bool:
+        return bool(await self._call("cache write", False, lambda client: client.setex(key, expiry_seconds, json.dumps(value))))
+
+    async def delete(self, *keys: str) -> bool:
+        if not keys:
+            return False
+        return await self._call("delete", False, lambda client: client.delete(*keys)) is not False
+
+    async def publish_json(self, channel: str, payload: Any) -> bool:
+        return await self._call("publish", False, lambda client: client.publish(channel, json.dumps(payload))) is not False
+
+    async def enqueue_json(self, queue: str, payload: Any) -> bool:
+        return await self._call("enqueue", False, lambda client: client.lpush(queue, json.dumps(payload))) is not False
+
+    async def read_counter(self, key: str, initial: int, expiry_seconds: int) -> Optional[int]:
+        async def read(client):
+            pipe = client.pipeline(transaction=False)
+            pipe.set(key, initial, nx=True, ex=expiry_seconds)
+            pipe.get(key)
+            return (await pipe.execute())[1]
+        value = await self._call("counter read", None, read)
+        return int(value) if value is not None else None
+
+    async def bump_counters(self, keys: Iterable[str], initial: int, expiry_seconds: int) -> bool:
+        keys = list(keys)
+        if not keys:
+            return False
+        async def bump(client):
+            pipe = client.pipeline(transaction=False)
+            for key in keys:
+                pipe.set(key, initial, nx=True)
+                pipe.incr(key)
+                pipe.expire(key, expiry_seconds)
+            return await pipe.execute()
+        return await self._call("counter bump", None, bump) is not None
+
+    async def eval(self, label: str, script: str, keys: Iterable[str], args: Iterable[Any], default: Any = None) -> Any:
+        """
+        Run a Lua script atomically, by EVALSHA after the first call. Returns default
+        when Redis is unavailable or the server has no scripting (e.g. fakeredis
+        without lupa), so callers need a fallback either way.
+        """
+        if not self.scripting:
+            return default
+        keys, args = list(keys), list(args)
+        async def run(client):
+            registered = self._scripts.get(script)
+            if registered is None:
+                registered = self._scripts[script] = client.register_script(script)
+            try:
+                return await registered(keys=keys, args=args)
+            except ResponseError as e:
+                # The server answered, so this is not an outage for the breaker
+                if "unknown command" not in str(e).lower():
+                    raise
+                self.scripting = False
+                logger.warning("⚠️ Redis server has no Lua scripting; script callers use their fallbacks")
+                return default
+        return await self._call(label, default, run)
+
+# Global asyncio Redis instance
+async_redis = AsyncRedisService()
@@ -1,61 +1,262 @@
 # app/services/cloudinary_service.py
 
+import asyncio
+import contextvars
+import threading
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
+import cloudinary.utils
+import time
 from cloudinary import CloudinaryImage
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, lru_cache
 import os
-from typing import Optional, Dict, Any
+import re
+from typing import Optional, Dict, Any, Callable
 from app.config import settings
+from app.services.upload_stream import CappedUploadStream, UploadTooLarge
+from app.services.metrics import record_cloudinary_call, timed
+
+# Responsive renditions served to the gallery; every one negotiates format and quality
+IMAGE_VARIANTS = {
+    "thumb": {"crop": "limit", "width": 320},
+    "medium": {"crop": "limit", "width": 800},
+    "full": {},
+}
+_VERSION_SEGMENT = re.compile(r"^v\d+$")
 
 class CloudinaryService:
     def __init__(self):
-        # Configure Cloudinary with environment variables
-        cloudinary.config(
-            cloud_name = settings.cloudinary_cloud_name,
-            api_key = settings.cloudinary_api_key,
-            api_secret = settings.cloudinary_api_secret,
-            secure = True
-        )
-
-    
+        self._configured = False
+        # The SDK is blocking, so async callers are served from a dedicated pool
+        # that never competes with Starlette's threadpool for sync routes.
+        self.max_workers = settings.cloudinary_max_workers
+        self.max_concurrency = settings.cloudinary_max_concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._queued = 0
+        self._peak_queued = 0
+        self._completed = 0
+        self._failed = 0
+
+    def _configure(self):
+        # Configure Cloudinary with environment variables on first SDK use, not at import
+        if not self._configured:
+            cloudinary.config(
+                cloud_name = settings.cloudinary_cloud_name,
+                api_key = settings.cloudinary_api_key,
+                api_secret = settings.cloudinary_api_secret,
+                secure = True
+            )
+            self._configured = True
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="cloudinary",
+                    )
+        return self._executor
+
+    def shutdown(self):
+        """Stop the executor, waiting for in-flight calls to finish"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking SDK call on the executor, capped by the concurrency limit"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        with self._lock:
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            with self._lock:
+                self._queued -= 1
+        with self._lock:
+            self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            # Carry the request's context into the worker thread so SDK timings count towards it
+            context = contextvars.copy_context()
+            result = await loop.run_in_executor(self.executor, context.run, partial(func, *args, **kwargs))
+            with self._lock:
+                self._completed += 1
+            return result
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._semaphore.release()
+
+    def metrics(self) -> Dict[str, int]:
+        """Snapshot of executor load and queue depth"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                "queued": self._queued,
+                "peak_queued": self._peak_queued,
+                "completed": self._completed,
+                "failed": self._failed,
+            }
+
     def upload_image(self, file_content: bytes, public_id: str, folder: str = "ssnapify", **options) -> Dict[str, Any]:
         """Upload an image to Cloudinary"""
+        self._configure()
         try:
-            result = cloudinary.uploader.upload(
-                file_content,
-                public_id=public_id,
-                folder=folder,
-                resource_type="image",
-                **options
-            )
+            with timed(record_cloudinary_call, "upload"):
+                result = cloudinary.uploader.upload(
+                    file_content,
+                    public_id=public_id,
+                    folder=folder,
+                    resource_type="image",
+                    **options
+                )
+            return result
+        except Exception as e:
+            raise Exception(f"Cloudinary upload failed: {str(e)}")
+
+    def upload_stream(self, stream: CappedUploadStream, public_id: str, folder: str = "ssnapify", **options) -> Dict[str, Any]:
+        """Upload a file-like object to Cloudinary in chunks of settings.upload_chunk_size"""
+        self._configure()
+        try:
+            with timed(record_cloudinary_call, "upload_large"):
+                result = cloudinary.uploader.upload_large(
+                    stream,
+                    public_id=public_id,
+                    folder=folder,
+                    resource_type="image",
+                    chunk_size=settings.upload_chunk_size,
+                    filename=stream.name,
+                    **options
+                )
             return result
+        except UploadTooLarge:
+            raise
         except Exception as e:
             raise Exception(f"Cloudinary upload failed: {str(e)}")
-    
+
     def destroy_image(self, public_id: str) -> Dict[str, Any]:
         """Delete an image from Cloudinary"""
+        self._configure()
         try:
-            result = cloudinary.uploader.destroy(public_id)
+            with timed(record_cloudinary_call, "destroy"):
+                result = cloudinary.uploader.destroy(public_id)
             return result
         except Exception as e:
             raise Exception(f"Cloudinary delete failed: {str(e)}")
-    
+
     def apply_transformation(self, public_id: str, transformation: Dict[str, Any]) -> str:
         """Apply transformation to an image and return the URL"""
+        self._configure()
         try:
             transformed_image = CloudinaryImage(public_id).build_url(**transformation)
             return transformed_image
         except Exception as e:
             raise Exception(f"Cloudinary transformation failed: {str(e)}")
-    
+
+    def materialize_derived(self, public_id: str, raw_transformation: str) -> Dict[str, Any]:
+        """Generate a derived asset now via explicit + eager instead of on first fetch"""
+        self._configure()
+        try:
+            with timed(record_cloudinary_call, "explicit"):
+                result = cloudinary.uploader.explicit(
+                    public_id,
+                    type="upload",
+                    resource_type="image",
+                    eager=[{"raw_transformation": raw_transformation}],
+                )
+            return result
+        except Exception as e:
+            raise Exception(f"Cloudinary eager transformation failed: {str(e)}")
+
+    def sign_upload(self, folder: str, **params) -> Dict[str, Any]:
+        """Signed parameters for a browser-to-Cloudinary upload; Cloudinary rejects them after an hour"""
+        self._configure()
+        to_sign = {"timestamp": int(time.time()), "folder": folder, **params}
+        signature = cloudinary.utils.api_sign_request(to_sign, settings.cloudinary_api_secret)
+        return {
+            **to_sign,
+            "signature": signature,
+            "api_key": settings.cloudinary_api_key,
+            "upload_url": f"https://api.cloudinary.com/v1_1/{settings.cloudinary_cloud_name}/image/upload",
+        }
+
+    def verify_upload(self, public_id: str, version: int, signature: str) -> bool:
+        """Check the signature Cloudinary returned with an upload response"""
+        self._configure()
+        return cloudinary.utils.verify_api_response_signature(public_id, version, signature)
+
+    def delivery_url(self, public_id: str, version: int, format: Optional[str] = None) -> str:
+        self._configure()
+        return CloudinaryImage(public_id).build_url(version=version, format=format, secure=True)
+
+    def variant_urls(self, public_id: str, secure_url: str) -> Dict[str, str]:
+        """thumb/medium/full f_auto,q_auto URLs for an image row; memoized per asset"""
+        return _variant_urls(self, public_id, secure_url)
+
     def get_image_info(self, public_id: str) -> Dict[str, Any]:
         """Get information about an image"""
+        self._configure()
         try:
-            result = cloudinary.api.resource(public_id)
+            with timed(record_cloudinary_call, "resource"):
+                result = cloudinary.api.resource(public_id)
             return result
         except Exception as e:
             raise Exception(f"Failed to get image info: {str(e)}")
 
+    async def upload_image_async(self, file_content: bytes, public_id: str, folder: str = "ssnapify", **options) -> Dict[str, Any]:
+        """Upload an image to Cloudinary without blocking the event loop"""
+        return await self._run(self.upload_image, file_content, public_id, folder, **options)
+
+    async def upload_stream_async(self, stream: CappedUploadStream, public_id: str, folder: str = "ssnapify", **options) -> Dict[str, Any]:
+        """Chunked upload of a file-like object without blocking the event loop"""
+        return await self._run(self.upload_stream, stream, public_id, folder, **options)
+
+    async def destroy_image_async(self, public_id: str) -> Dict[str, Any]:
+        """Delete an image from Cloudinary without blocking the event loop"""
+        return await self._run(self.destroy_image, public_id)
+
+    async def get_image_info_async(self, public_id: str) -> Dict[str, Any]:
+        """Get information about an image without blocking the event loop"""
+        return await self._run(self.get_image_info, public_id)
+
+@lru_cache(maxsize=8192)
+def _variant_urls(service: CloudinaryService, public_id: str, secure_url: str) -> Dict[str, str]:
+    # Split a delivery URL into <effects chain>/v<version>/<asset path>. Derived rows
+    # carry effects in their URL (and a synthetic public_id), so the chain is kept
+    # ahead of the resize; originals have an empty chain.
+    _, _, remainder = secure_url.partition("/upload/")
+    segments = remainder.split("/")
+    version_index = next((i for i, s in enumerate(segments) if _VERSION_SEGMENT.match(s)), None)
+    if version_index is None:
+        return {name: secure_url for name in IMAGE_VARIANTS}
+    chain = "/".join(segments[:version_index])
+    asset_id, ext = os.path.splitext("/".join(segments[version_index + 1:]))
+    variants = {}
+    for name, resize in IMAGE_VARIANTS.items():
+        steps = ([{"raw_transformation": chain}] if chain else []) + [{**resize, "fetch_format": "auto", "quality": "auto"}]
+        variants[name] = service.apply_transformation(asset_id, {
+            "transformation": steps,
+            "version": segments[version_index][1:],
+            "format": ext.lstrip(".") or None,
+            "secure": True,
+        })
+    return variants
+
 # Create the instance that will be imported
 cloudinary_service = CloudinaryService()
@@ -0,0 +1,78 @@
+# app/services/content_version.py
+
+import hashlib
+import time
+from typing import Optional
+from fastapi import Request
+from fastapi.responses import Response
+from app.config import settings
+from app.services.redis_service import redis_service
+from app.services.async_redis import async_redis
+
+# Listings and account data are per-user and may change at any time: the browser
+# keeps them but revalidates with If-None-Match on every use.
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+def _key(user_id: int) -> str:
+    return f"content_version:{user_id}"
+
+def _seed() -> int:
+    # Counters evicted from Redis restart from the clock, never from a value an old ETag carried
+    return time.time_ns()
+
+async def current_version(user_id: int) -> Optional[int]:
+    """The user's content version, or None when Redis is unavailable (no conditional GETs)"""
+    return await async_redis.read_counter(_key(user_id), _seed(), settings.content_version_ttl_seconds)
+
+def bump_content_version(*user_ids: int) -> bool:
+    """
+    Invalidate every ETag issued for these users. Call after the commit that
+    changed their images or credits, so no request can pair the new version
+    with old rows.
+    """
+    return redis_service.bump_counters(
+        (_key(user_id) for user_id in user_ids), _seed(), settings.content_version_ttl_seconds
+    )
+
+async def bump_content_version_async(*user_ids: int) -> bool:
+    """bump_content_version() for request handlers"""
+    return await async_redis.bump_counters(
+        (_key(user_id) for user_id in user_ids), _seed(), settings.content_version_ttl_seconds
+    )
+
+def make_etag(user_id: int, version: int, request: Request, *extra) -> str:
+    raw = "|".join(str(part) for part in (user_id, version, request.url.path, request.url.query, *extra))
+    return f'"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+def account_etag_parts(user) -> tuple:
+    """
+    Account fields a response renders from the principal, which may come from
+    the user cache: an ETag minted over a stale copy must differ from one over
+    the fresh row, even when both carry the same content version.
+    """
+    return (user.credit_balance, user.plan_id, user.next_credit_reset_at, user.plan_expires_at)
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+async def conditional_get(request: Request, response: Response, user_id: int, *extra) -> Optional[Response]:
+    """
+    Tag the response with the user's content version and return a bare 304 if the
+    client already holds it. Routes call this before touching the database and
+    return the 304 as is.
+    """
+    version = await current_version(user_id)
+    if version is None:
+        return None
+    headers = {
+        "ETag": make_etag(user_id, version, request, *extra),
+        "Cache-Control": PRIVATE_CACHE_CONTROL,
+        "Vary": "Authorization",
+    }
+    if _matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,65 @@
+# app/services/events.py
+
+import json
+import secrets
+from typing import Any, AsyncIterator, Dict, Optional
+from app.models.image import Image
+from app.models.schemas import ImageOut
+from app.services.redis_service import redis_service
+from app.services.async_redis import async_redis
+
+HEARTBEAT_SECONDS = 15
+TICKET_TTL_SECONDS = 60
+
+def user_channel(user_id: int) -> str:
+    return f"user_events:{user_id}"
+
+def image_payload(image: Image) -> Dict[str, Any]:
+    return ImageOut.model_validate(image).model_dump(mode="json")
+
+def job_payload(image: Image) -> Dict[str, Any]:
+    return {"job_id": image.id, "status": image.status, "error": image.error, "image": image_payload(image)}
+
+def publish_user_event(user_id: int, event: str, payload: Dict[str, Any]) -> bool:
+    """Fan an event out to every worker holding an SSE stream for this user"""
+    return redis_service.publish_json(user_channel(user_id), {"event": event, "data": payload})
+
+async def publish_user_event_async(user_id: int, event: str, payload: Dict[str, Any]) -> bool:
+    """publish_user_event() for request handlers"""
+    return await async_redis.publish_json(user_channel(user_id), {"event": event, "data": payload})
+
+def _ticket_key(ticket: str) -> str:
+    return f"sse_ticket:{ticket}"
+
+async def issue_stream_ticket(user_id: int) -> Optional[str]:
+    """
+    A random ticket that opens one event stream for this user. EventSource can't
+    send headers, and a URL ends up in access logs, so the stream is opened with
+    this single-use, short-lived value instead of the access token.
+    """
+    ticket = secrets.token_urlsafe(32)
+    if not await async_redis.set_json(_ticket_key(ticket), user_id, TICKET_TTL_SECONDS):
+        return None
+    return ticket
+
+async def redeem_stream_ticket(ticket: str) -> Optional[int]:
+    """The ticket's user id, consuming the ticket; None if unknown, used or expired"""
+    return await async_redis.pop_json(_ticket_key(ticket))
+
+async def stream_user_events(user_id: int) -> AsyncIterator[str]:
+    """Server-Sent Events frames for one user, with comment heartbeats to keep proxies open"""
+    # Each stream takes its own connection from the subscription pool
+    pubsub = async_redis.pubsub()
+    await pubsub.subscribe(user_channel(user_id))
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=HEARTBEAT_SECONDS)
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+            event = json.loads(message["data"])
+            yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+    finally:
+        await pubsub.unsubscribe()
+        await pubsub.aclose()
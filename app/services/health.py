@@ -0,0 +1,75 @@
+# app/services/health.py
+"""
+Liveness and readiness for orchestrator probes. Dependency checks are cached
+for settings.health_check_cache_seconds, so frequent probes from many
+replicas cost one DB and one Redis round trip per window, not per probe.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from sqlalchemy import text
+from app.config import settings
+from app.database import async_engine
+from app.services.async_redis import async_redis
+
+logger = logging.getLogger("ssnapify")
+
+CHECK_TIMEOUT_SECONDS = 2.0
+
+class CachedCheck:
+    def __init__(self, name: str, check: Callable[[], Awaitable[bool]], ttl_seconds: float):
+        self.name = name
+        self.check = check
+        self.ttl_seconds = ttl_seconds
+        self._result: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def result(self) -> Dict[str, Any]:
+        if self._result is not None and time.monotonic() < self._expires_at:
+            return self._result
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Concurrent probes wait for the one check in flight instead of stacking up
+            if self._result is None or time.monotonic() >= self._expires_at:
+                self._result = await self._run()
+                self._expires_at = time.monotonic() + self.ttl_seconds
+        return self._result
+
+    async def _run(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        error = None
+        try:
+            ok = await asyncio.wait_for(self.check(), CHECK_TIMEOUT_SECONDS)
+        except Exception as e:
+            ok, error = False, f"{type(e).__name__}: {e}"
+            logger.warning(f"⚠️ Health check {self.name} failed: {error}")
+        result = {
+            "ok": bool(ok),
+            "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+            "checked_at": time.time(),
+        }
+        if error:
+            result["error"] = error
+        return result
+
+async def _check_database() -> bool:
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    return True
+
+database_check = CachedCheck("database", _check_database, settings.health_check_cache_seconds)
+redis_check = CachedCheck("redis", async_redis.ping, settings.health_check_cache_seconds)
+
+async def readiness() -> Dict[str, Any]:
+    """status is ready, degraded (Redis down; the app fails open) or not_ready"""
+    database, redis = await asyncio.gather(database_check.result(), redis_check.result())
+    if not database["ok"] or (settings.health_requires_redis and not redis["ok"]):
+        status = "not_ready"
+    elif not redis["ok"]:
+        status = "degraded"
+    else:
+        status = "ready"
+    return {"status": status, "checks": {"database": database, "redis": redis}}
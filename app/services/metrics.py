@@ -0,0 +1,247 @@
+# app/services/metrics.py
+"""
+In-process metrics rendered in the Prometheus text format at /health/metrics
+(admins, or scrapers sending METRICS_TOKEN as a bearer token).
+Values are per process: scrape each worker (or aggregate in Prometheus).
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from app.config import settings
+
+logger = logging.getLogger("ssnapify.db")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# (labels, value) samples produced by a collector for one gauge
+GaugeSamples = Iterable[Tuple[Dict[str, str], float]]
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Iterable[str], values: Iterable, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _number(value: float) -> str:
+    if isinstance(value, bool):
+        value = int(value)
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1):
+        key = tuple(str(label) for label in labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {_number(value)}")
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets) + (float("inf"),)
+        # per label set: [bucket counts..., sum, count]
+        self._series: Dict[Tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        key = tuple(str(label) for label in labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, *labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    le = 'le="' + _number(bound) + '"'
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {count}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(series[-2])}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {series[-1]}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._gauges: List[Tuple[str, str, Callable[[], GaugeSamples]]] = []
+
+    def counter(self, *args, **kwargs) -> Counter:
+        metric = Counter(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        metric = Histogram(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, collect: Callable[[], GaugeSamples]):
+        """A gauge read at scrape time, e.g. from a service's metrics() snapshot"""
+        self._gauges.append((name, documentation, collect))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, documentation, collect in self._gauges:
+            lines += [f"# HELP {name} {documentation}", f"# TYPE {name} gauge"]
+            for labels, value in collect():
+                lines.append(f"{name}{_labels(labels.keys(), labels.values())} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+REQUEST_SECONDS = registry.histogram(
+    "ssnapify_http_request_duration_seconds", "Request latency by route template and status", ("method", "route", "status"),
+)
+REQUEST_DB_QUERIES = registry.histogram(
+    "ssnapify_http_request_db_queries", "DB statements executed per request", ("route",),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50),
+)
+REQUEST_DB_SECONDS = registry.histogram(
+    "ssnapify_http_request_db_seconds", "Time spent in DB statements per request", ("route",),
+)
+DB_QUERY_SECONDS = registry.histogram(
+    "ssnapify_db_query_duration_seconds", "DB statement latency", ("engine",),
+)
+REDIS_CALL_SECONDS = registry.histogram(
+    "ssnapify_redis_call_duration_seconds", "asyncio Redis round trips by operation", ("operation",),
+)
+REDIS_ERRORS = registry.counter(
+    "ssnapify_redis_errors_total", "Failed Redis calls by operation", ("operation",),
+)
+CLOUDINARY_CALL_SECONDS = registry.histogram(
+    "ssnapify_cloudinary_call_duration_seconds", "Cloudinary API call latency by operation", ("operation",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+CLOUDINARY_ERRORS = registry.counter(
+    "ssnapify_cloudinary_errors_total", "Failed Cloudinary API calls by operation", ("operation",),
+)
+CREDIT_DEBITS = registry.counter(
+    "ssnapify_credit_debits_total", "Credit debits by transformation type", ("transformation_type",),
+)
+CREDITS_DEBITED = registry.counter(
+    "ssnapify_credits_debited_total", "Credits debited by transformation type", ("transformation_type",),
+)
+JOB_SECONDS = registry.histogram(
+    "ssnapify_job_duration_seconds", "Scheduled job run time by job and outcome", ("job", "status"),
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0),
+)
+
+# Statement text kept per traced SQL event; parameters are never recorded
+MAX_STATEMENT_CHARS = 1000
+MAX_TRACE_EVENTS = 1000
+
+@dataclass
+class RequestStats:
+    """Per-request dependency counters, filled in by DB/Redis/Cloudinary instrumentation"""
+    scope: Optional[Dict[str, Any]] = None
+    started: float = field(default_factory=time.perf_counter)
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    redis_calls: int = 0
+    redis_seconds: float = 0.0
+    http_calls: int = 0
+    http_seconds: float = 0.0
+    # Individual calls, only collected while the request is being profiled
+    trace: Optional[List[Dict[str, Any]]] = None
+
+    @property
+    def route(self) -> str:
+        """Route template once routing has matched, e.g. /images/{image_id}"""
+        if self.scope is None:
+            return "unmatched"
+        return getattr(self.scope.get("route"), "path", "unmatched")
+
+    def add_event(self, kind: str, name: str, seconds: float, **details):
+        if self.trace is not None and len(self.trace) < MAX_TRACE_EVENTS:
+            self.trace.append({
+                "type": kind,
+                "name": name,
+                "start_ms": round((time.perf_counter() - seconds - self.started) * 1000, 3),
+                "duration_ms": round(seconds * 1000, 3),
+                **details,
+            })
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("ssnapify_request_stats", default=None)
+
+def record_db_query(engine_name: str, seconds: float, statement: Optional[str] = None):
+    DB_QUERY_SECONDS.observe(seconds, engine_name)
+    stats = current_request.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += seconds
+        if statement is not None:
+            stats.add_event("sql", engine_name, seconds, statement=statement[:MAX_STATEMENT_CHARS])
+    if settings.slow_query_ms and seconds * 1000 >= settings.slow_query_ms:
+        route = f"{stats.scope['method']} {stats.route}" if stats is not None and stats.scope else "background"
+        logger.warning(f"🐢 Slow query ({seconds * 1000:.0f}ms, {engine_name}) from {route}: {' '.join((statement or '').split())[:MAX_STATEMENT_CHARS]}")
+
+def record_redis_call(operation: str, seconds: float, failed: bool = False):
+    REDIS_CALL_SECONDS.observe(seconds, operation)
+    if failed:
+        REDIS_ERRORS.inc(operation)
+    stats = current_request.get()
+    if stats is not None:
+        stats.redis_calls += 1
+        stats.redis_seconds += seconds
+        stats.add_event("redis", operation, seconds, failed=failed)
+
+def record_cloudinary_call(operation: str, seconds: float, failed: bool = False):
+    CLOUDINARY_CALL_SECONDS.observe(seconds, operation)
+    if failed:
+        CLOUDINARY_ERRORS.inc(operation)
+    stats = current_request.get()
+    if stats is not None:
+        stats.http_calls += 1
+        stats.http_seconds += seconds
+        stats.add_event("http", f"cloudinary {operation}", seconds, failed=failed)
+
+@contextmanager
+def timed(record: Callable[..., None], operation: str):
+    """Time a block and pass (operation, seconds, failed) to record_redis_call / record_cloudinary_call"""
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        record(operation, time.perf_counter() - started, failed=failed)
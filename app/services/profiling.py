@@ -0,0 +1,169 @@
+# app/services/profiling.py
+"""
+On-demand request profiles. A profiled request collects every SQL statement,
+Redis command and outbound Cloudinary call it makes (see RequestStats.trace)
+plus a sampled stack profile, and the resulting report is kept under an id
+returned in the X-Profile-Id response header and served at /admin/profiles.
+"""
+import logging
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from app.config import settings
+from app.services.async_redis import async_redis
+from app.services.metrics import RequestStats
+
+logger = logging.getLogger("ssnapify")
+
+REPORT_KEY = "profile:{}"
+MAX_STACKS = 200
+# Leaf frames of threads parked waiting for work (event loop select, pool queues, aiosqlite)
+IDLE_FRAMES = {"select", "poll", "wait", "_worker", "_connection_worker_thread"}
+
+class StackSampler:
+    """
+    Samples the Python stack of every other thread on a timer. The event loop
+    thread is shared by all in-flight requests, so concurrent work shows up in
+    the profile too; the trace events are the request-exact part of a report.
+    """
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            self._sample()
+
+    def _sample(self):
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        self.samples += 1
+        for ident, frame in sys._current_frames().items():
+            if ident == own or frame.f_code.co_name in IDLE_FRAMES:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            stack.append(names.get(ident, str(ident)))
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> List[Dict[str, Any]]:
+        """Most frequent stacks in collapsed form (thread;outer;...;leaf), as flamegraph tools read them"""
+        return [{"stack": stack, "samples": count} for stack, count in self.stacks.most_common(MAX_STACKS)]
+
+class RequestProfile:
+    def __init__(self, stats: RequestStats, trigger: str):
+        self.id = secrets.token_hex(8)
+        self.stats = stats
+        self.trigger = trigger
+        self.started_at = datetime.now(timezone.utc)
+        self.sampler = StackSampler(settings.profiling_interval_ms / 1000)
+        # Work done before profiling began (e.g. the admin check) is left out of the breakdown
+        self._baseline = self._totals()
+        self._started = time.perf_counter()
+        stats.trace = []
+
+    def _totals(self) -> Dict[str, tuple]:
+        stats = self.stats
+        return {
+            "sql": (stats.db_queries, stats.db_seconds),
+            "redis": (stats.redis_calls, stats.redis_seconds),
+            "http": (stats.http_calls, stats.http_seconds),
+        }
+
+    def start(self):
+        self.sampler.start()
+
+    def finish(self, status_code: int) -> Dict[str, Any]:
+        self.sampler.stop()
+        stats = self.stats
+        # Stop collecting: fire-and-forget tasks of this request may still be running
+        events, stats.trace = stats.trace, None
+        duration_ms = (time.perf_counter() - self._started) * 1000
+        breakdown = {
+            kind: {"count": count - self._baseline[kind][0], "ms": round((seconds - self._baseline[kind][1]) * 1000, 3)}
+            for kind, (count, seconds) in self._totals().items()
+        }
+        # Time not spent waiting on a dependency: app code, serialization, waiting for the loop
+        breakdown["other_ms"] = round(max(0.0, duration_ms - sum(part["ms"] for part in breakdown.values())), 3)
+        return {
+            "id": self.id,
+            "trigger": self.trigger,
+            "started_at": self.started_at.isoformat(),
+            "method": stats.scope["method"],
+            "path": stats.scope["path"],
+            "route": stats.route,
+            "status": status_code,
+            "duration_ms": round(duration_ms, 3),
+            "breakdown": breakdown,
+            "events": events,
+            "profile": {
+                "interval_ms": settings.profiling_interval_ms,
+                "samples": self.sampler.samples,
+                "stacks": self.sampler.collapsed(),
+            },
+        }
+
+class ProfileStore:
+    """Recent reports in memory, mirrored to Redis so any instance can serve them"""
+    def __init__(self, max_reports: int):
+        self.max_reports = max_reports
+        self._reports: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._active_sampled = 0
+
+    def begin(self, stats: RequestStats, requested: bool) -> Optional[RequestProfile]:
+        """A running profile for an admin-requested or sampled request; None past the concurrency cap"""
+        with self._lock:
+            if not requested:
+                if self._active_sampled >= settings.profiling_max_concurrent:
+                    return None
+                self._active_sampled += 1
+        profile = RequestProfile(stats, "header" if requested else "sampled")
+        profile.start()
+        return profile
+
+    async def finish(self, profile: RequestProfile, status_code: int) -> Dict[str, Any]:
+        report = profile.finish(status_code)
+        with self._lock:
+            if profile.trigger == "sampled":
+                self._active_sampled -= 1
+            self._reports[profile.id] = report
+            while len(self._reports) > self.max_reports:
+                self._reports.popitem(last=False)
+        await async_redis.set_json(REPORT_KEY.format(profile.id), report, settings.profiling_report_ttl_seconds)
+        logger.info(f"🔬 Profiled {report['method']} {report['route']} in {report['duration_ms']:.0f}ms: {profile.id}")
+        return report
+
+    async def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            report = self._reports.get(profile_id)
+        return report or await async_redis.get_json(REPORT_KEY.format(profile_id))
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Summaries of this process's reports, newest first"""
+        with self._lock:
+            reports = list(self._reports.values())
+        keys = ("id", "trigger", "started_at", "method", "route", "status", "duration_ms", "breakdown")
+        return [{key: report[key] for key in keys} for report in reversed(reports)]
+
+profiles = ProfileStore(max_reports=settings.profiling_max_reports)
@@ -0,0 +1,123 @@
+# app/services/rate_limit.py
+"""
+Per-user token buckets for expensive route groups, sized by plan (RATE_LIMITS in
+app/billing/plans.py). Buckets live in Redis and are updated by one Lua script,
+so every instance shares them; while Redis is unavailable each process keeps
+its own buckets, which is looser across instances but never blocks requests.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Tuple
+from fastapi import Depends, HTTPException, Response
+from app.auth.security import get_current_user
+from app.billing.plans import RateLimit, rate_limit_for
+from app.config import settings
+from app.models.user import User
+from app.services.async_redis import async_redis
+from app.services.metrics import registry
+
+RATE_LIMITED = registry.counter(
+    "ssnapify_rate_limited_total", "Requests rejected by rate limits by route group and bucket store", ("group", "store"),
+)
+
+# KEYS[1] bucket hash; ARGV capacity, refill per second, cost.
+# Uses the server clock so instances with skewed clocks share buckets fairly.
+TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+@dataclass
+class Decision:
+    allowed: bool
+    limit: RateLimit
+    tokens: float
+    store: str
+
+    @property
+    def rate_per_second(self) -> float:
+        return self.limit.per_minute / 60
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil((1 - self.tokens) / self.rate_per_second))
+
+    def headers(self) -> Dict[str, str]:
+        window = math.ceil(self.limit.burst / self.rate_per_second)
+        headers = {
+            "RateLimit-Limit": str(self.limit.burst),
+            "RateLimit-Remaining": str(max(0, math.floor(self.tokens))),
+            # Seconds until the bucket is full again
+            "RateLimit-Reset": str(max(0, math.ceil((self.limit.burst - self.tokens) / self.rate_per_second))),
+            "RateLimit-Policy": f"{self.limit.burst};w={window}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+class LocalBuckets:
+    """In-process token buckets, least recently used evicted past max_keys"""
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, ts = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, tokens
+
+class RateLimiter:
+    def __init__(self):
+        self.local = LocalBuckets(settings.rate_limit_local_max_keys)
+
+    async def take(self, user: User, group: str) -> Decision:
+        limit = rate_limit_for(user.plan_id, group)
+        key = f"ratelimit:{group}:{user.id}"
+        rate = limit.per_minute / 60
+        result = await async_redis.eval("rate limit", TOKEN_BUCKET, [key], [limit.burst, rate, 1])
+        if result is not None:
+            allowed, tokens = result
+            return Decision(bool(allowed), limit, float(tokens), "redis")
+        allowed, tokens = self.local.take(key, limit.burst, rate)
+        return Decision(allowed, limit, tokens, "local")
+
+rate_limiter = RateLimiter()
+
+def rate_limit(group: str):
+    """Route dependency: one token from the user's bucket for group, or 429; admins are exempt"""
+    async def dependency(response: Response, current_user: User = Depends(get_current_user)):
+        if not settings.rate_limit_enabled or current_user.is_admin:
+            return
+        decision = await rate_limiter.take(current_user, group)
+        if not decision.allowed:
+            RATE_LIMITED.inc(group, decision.store)
+            raise HTTPException(status_code=429, detail=f"Rate limit exceeded; try again in {decision.retry_after}s", headers=decision.headers())
+        response.headers.update(decision.headers())
+    return dependency
@@ -1,51 +1,166 @@
 import redis
 import json
+import logging
 import os
+import threading
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import Optional, Tuple, Dict, Any, List
 from app.config import settings
 
+logger = logging.getLogger("ssnapify.redis")
+
+# REDIS_URL=fakeredis:// runs both the sync and asyncio services against one in-memory server
+FAKE_URL_SCHEME = "fakeredis://"
+_fake_server = None
+
+def is_fake_url(url: Optional[str]) -> bool:
+    return bool(url) and url.startswith(FAKE_URL_SCHEME)
+
+def fake_server():
+    """Process-wide fakeredis server; fakeredis is a test dependency, imported only in this mode"""
+    global _fake_server
+    if _fake_server is None:
+        import fakeredis
+        _fake_server = fakeredis.FakeServer()
+    return _fake_server
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated Redis errors instead of paying the socket timeout on
+    every call. While open, a background thread re-probes until Redis answers.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+
+    def __init__(self, probe, failure_threshold: int, reset_seconds: float):
+        self._probe = probe
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_count = 0
+        self.fast_failures = 0
+        self._lock = threading.Lock()
+        self._prober: Optional[threading.Thread] = None
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        self.fast_failures += 1
+        return False
+
+    def record_success(self):
+        self.consecutive_failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_count += 1
+                logger.warning(f"⚠️ Redis circuit opened after {self.consecutive_failures} failures")
+                self._start_prober()
+
+    def _start_prober(self):
+        if self._prober and self._prober.is_alive():
+            return
+        self._prober = threading.Thread(target=self._reprobe, name="redis-breaker-probe", daemon=True)
+        self._prober.start()
+
+    def _reprobe(self):
+        while self.state == self.OPEN:
+            time.sleep(self.reset_seconds)
+            try:
+                if self._probe():
+                    with self._lock:
+                        self.state = self.CLOSED
+                        self.consecutive_failures = 0
+                    logger.info("✅ Redis circuit closed")
+            except Exception:
+                pass
+
 class RedisService:
     def __init__(self):
-        self.redis_client = None
-        self.connect()
-    
+        # The client is built on first use, so importing the app costs no network I/O
+        self._client = None
+        self._connected = False
+        self.breaker = CircuitBreaker(
+            self._raw_ping,
+            failure_threshold=settings.redis_breaker_failure_threshold,
+            reset_seconds=settings.redis_breaker_reset_seconds,
+        )
+        self.round_trips = 0
+        self.round_trips_saved = 0
+
+    @property
+    def redis_client(self):
+        if not self._connected:
+            self.connect()
+        return self._client
+
+    @redis_client.setter
+    def redis_client(self, client):
+        self._client = client
+        self._connected = True
+
     def connect(self):
+        """Build the client; no PING, the breaker learns liveness from the first real command"""
+        self._connected = True
         try:
             redis_url = os.getenv("REDIS_URL")
-            if redis_url:
-                self.redis_client = redis.from_url(
-                    redis_url, 
+            if is_fake_url(redis_url):
+                import fakeredis
+                self._client = fakeredis.FakeRedis(server=fake_server(), decode_responses=True)
+            elif redis_url:
+                self._client = redis.from_url(
+                    redis_url,
                     decode_responses=True,
                     socket_connect_timeout=5,
                     socket_timeout=5,
                     retry_on_timeout=True
                 )
-                # Test connection
-                self.redis_client.ping()
-                print("✅ Redis connected successfully")
             else:
-                print("⚠️ No Redis URL provided")
+                logger.warning("⚠️ No Redis URL provided")
         except Exception as e:
-            print(f"⚠️ Redis connection failed: {e}")
-            self.redis_client = None
-    
+            logger.warning(f"⚠️ Redis connection failed: {e}")
+            self._client = None
+
+    def _raw_ping(self) -> bool:
+        return bool(self.redis_client and self.redis_client.ping())
+
     def ping(self) -> bool:
         try:
             if self.redis_client:
                 self.redis_client.ping()
+                self.breaker.record_success()
                 return True
             return False
         except:
+            self.breaker.record_failure()
             return False
-        
+
     @property
     def available(self):
-        try:
-            return self.ping()
-        except Exception:
-            return False
-    
+        # No PING here: liveness is tracked by the breaker from real command outcomes.
+        return self.redis_client is not None and self.breaker.allow()
+
+    def _failed(self, label: str, e: Exception):
+        self.breaker.record_failure()
+        logger.warning(f"Redis {label} error: {e}")
+
+    def metrics(self) -> Dict[str, Any]:
+        """Round-trip counters and circuit breaker state"""
+        return {
+            "connected": self.redis_client is not None,
+            "round_trips": self.round_trips,
+            "round_trips_saved": self.round_trips_saved,
+            "breaker_state": self.breaker.state,
+            "breaker_consecutive_failures": self.breaker.consecutive_failures,
+            "breaker_opened_count": self.breaker.opened_count,
+            "breaker_fast_failures": self.breaker.fast_failures,
+        }
+
     def blacklist_token(self, token: str, expires_in_minutes: int = None) -> bool:
         """Add token to blacklist with expiration"""
         if not self.available:
@@ -53,34 +168,39 @@ class RedisService:
         try:
             if expires_in_minutes is None:
                 expires_in_minutes = settings.access_token_expire_minutes
-            
+
             blacklist_data = {
                 "blacklisted_at": datetime.now(timezone.utc).isoformat(),
                 "reason": "user_logout"
             }
-            
+
             expiry_seconds = expires_in_minutes * 60
-            
-            return self.redis_client.setex(
-                f"blacklist:{token}", 
-                expiry_seconds, 
+
+            self.round_trips += 1
+            result = self.redis_client.setex(
+                f"blacklist:{token}",
+                expiry_seconds,
                 json.dumps(blacklist_data)
             )
+            self.breaker.record_success()
+            return result
         except Exception as e:
-            print(f"Redis blacklist error: {e}")
+            self._failed("blacklist", e)
             return False
-    
+
     def is_token_blacklisted(self, token: str) -> bool:
         """Check if token is blacklisted"""
         if not self.available:
             return False
         try:
+            self.round_trips += 1
             result = self.redis_client.get(f"blacklist:{token}")
+            self.breaker.record_success()
             return result is not None
         except Exception as e:
-            print(f"Redis blacklist check error: {e}")
+            self._failed("blacklist check", e)
             return False
-    
+
     def blacklist_all_user_tokens(self, user_id: str) -> bool:
         """Blacklist all tokens for a specific user"""
         if not self.available:
@@ -90,28 +210,258 @@ class RedisService:
                 "logged_out_at": datetime.now(timezone.utc).isoformat(),
                 "reason": "user_logout_all_devices"
             }
-            
+
             expiry_seconds = 24 * 60 * 60  # 24 hours
-            
-            return self.redis_client.setex(
-                f"user_logout:{user_id}", 
-                expiry_seconds, 
+
+            self.round_trips += 1
+            result = self.redis_client.setex(
+                f"user_logout:{user_id}",
+                expiry_seconds,
                 json.dumps(user_logout_data)
             )
+            self.breaker.record_success()
+            return result
         except Exception as e:
-            print(f"Redis user logout error: {e}")
+            self._failed("user logout", e)
             return False
-    
+
     def get_user_logout_time(self, user_id: str) -> Optional[datetime]:
         """Get when user logged out from all devices"""
         if not self.available:
             return None
         try:
+            self.round_trips += 1
             result = self.redis_client.get(f"user_logout:{user_id}")
-            if result:
-                data = json.loads(result)
-                return datetime.fromisoformat(data["logged_out_at"])
+            self.breaker.record_success()
+            return self._parse_logout_time(result)
+        except Exception as e:
+            self._failed("user logout lookup", e)
+            return None
+
+    def check_token_state(self, token: str, user_id: str) -> Tuple[bool, Optional[datetime]]:
+        """
+        Blacklist and logout-all-devices lookups in one pipelined round trip.
+        Returns (is_blacklisted, user_logout_time); fails open like the single-key checks.
+        """
+        if not self.available:
+            return False, None
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.get(f"blacklist:{token}")
+            pipe.get(f"user_logout:{user_id}")
+            blacklisted, logout = pipe.execute()
+            self.breaker.record_success()
+            # Two GETs plus the two PINGs the old per-call availability check made
+            self.round_trips += 1
+            self.round_trips_saved += 3
+            return blacklisted is not None, self._parse_logout_time(logout)
+        except Exception as e:
+            self._failed("token state", e)
+            return False, None
+
+    def get_json(self, key: str) -> Optional[Any]:
+        """Fetch and decode a JSON value, or None if missing or Redis is unavailable"""
+        if not self.available:
+            return None
+        try:
+            self.round_trips += 1
+            raw = self.redis_client.get(key)
+            self.breaker.record_success()
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            self._failed("cache read", e)
+            return None
+
+    def set_json(self, key: str, value: Any, expiry_seconds: int) -> bool:
+        """Store a JSON-encodable value with an expiry"""
+        if not self.available:
+            return False
+        try:
+            self.round_trips += 1
+            result = self.redis_client.setex(key, expiry_seconds, json.dumps(value))
+            self.breaker.record_success()
+            return bool(result)
+        except Exception as e:
+            self._failed("cache write", e)
+            return False
+
+    def delete(self, *keys: str) -> bool:
+        if not self.available or not keys:
+            return False
+        try:
+            self.round_trips += 1
+            self.redis_client.delete(*keys)
+            self.breaker.record_success()
+            return True
+        except Exception as e:
+            self._failed("delete", e)
+            return False
+
+    def read_counter(self, key: str, initial: int, expiry_seconds: int) -> Optional[int]:
+        """Current value of a counter, seeding it with initial if missing; None if Redis is unavailable"""
+        if not self.available:
+            return None
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.set(key, initial, nx=True, ex=expiry_seconds)
+            pipe.get(key)
+            _, value = pipe.execute()
+            self.round_trips += 1
+            self.breaker.record_success()
+            return int(value)
+        except Exception as e:
+            self._failed("counter read", e)
+            return None
+
+    def bump_counters(self, keys, initial: int, expiry_seconds: int) -> bool:
+        """Increment counters in one round trip, seeding missing ones with initial first"""
+        keys = list(keys)
+        if not self.available or not keys:
+            return False
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipe.set(key, initial, nx=True)
+                pipe.incr(key)
+                pipe.expire(key, expiry_seconds)
+            pipe.execute()
+            self.round_trips += 1
+            self.breaker.record_success()
+            return True
+        except Exception as e:
+            self._failed("counter bump", e)
+            return False
+
+    def publish_json(self, channel: str, payload: Any) -> bool:
+        """Fire-and-forget pub/sub message"""
+        if not self.available:
+            return False
+        try:
+            self.round_trips += 1
+            self.redis_client.publish(channel, json.dumps(payload))
+            self.breaker.record_success()
+            return True
+        except Exception as e:
+            self._failed("publish", e)
+            return False
+
+    def enqueue_json(self, queue: str, payload: Any) -> bool:
+        """Push a job onto a Redis list queue"""
+        if not self.available:
+            return False
+        try:
+            self.round_trips += 1
+            self.redis_client.lpush(queue, json.dumps(payload))
+            self.breaker.record_success()
+            return True
+        except Exception as e:
+            self._failed("enqueue", e)
+            return False
+
+    def claim_json(self, queue: str, processing: str, timeout_seconds: int = 2) -> Optional[Tuple[str, Any]]:
+        """
+        Blocking move of the oldest job onto a processing list (BLMOVE), stamped
+        with its claim time; returns (raw, payload). The job stays there until
+        ack_json(), so a worker that dies mid-job loses nothing.
+        Keep the timeout under the socket timeout.
+        """
+        if not self.available:
             return None
+        try:
+            self.round_trips += 1
+            raw = self.redis_client.blmove(queue, processing, timeout_seconds, "RIGHT", "LEFT")
+            if raw is None:
+                self.breaker.record_success()
+                return None
+            self.round_trips += 1
+            self.redis_client.hset(f"{processing}:claimed", raw, time.time())
+            self.breaker.record_success()
+            return raw, json.loads(raw)
+        except Exception as e:
+            self._failed("claim", e)
+            return None
+
+    def ack_json(self, processing: str, raw: str) -> bool:
+        """Drop a claimed job from the processing list; False if another caller already did"""
+        if not self.available:
+            return False
+        try:
+            self.round_trips += 1
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.lrem(processing, 1, raw)
+            pipe.hdel(f"{processing}:claimed", raw)
+            removed = pipe.execute()[0]
+            self.breaker.record_success()
+            return bool(removed)
+        except Exception as e:
+            self._failed("ack", e)
+            return False
+
+    def stale_claims(self, processing: str, older_than_seconds: float) -> List[Tuple[str, Any]]:
+        """Claimed jobs not acked within older_than_seconds, oldest first"""
+        if not self.available:
+            return []
+        try:
+            self.round_trips += 1
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.lrange(processing, 0, -1)
+            pipe.hgetall(f"{processing}:claimed")
+            items, claimed = pipe.execute()
+            now = time.time()
+            stale = []
+            for raw in reversed(items):
+                if raw not in claimed:
+                    # Claimer died between BLMOVE and the stamp: start its clock now
+                    self.round_trips += 1
+                    self.redis_client.hsetnx(f"{processing}:claimed", raw, now)
+                elif now - float(claimed[raw]) >= older_than_seconds:
+                    stale.append((raw, json.loads(raw)))
+            self.breaker.record_success()
+            return stale
+        except Exception as e:
+            self._failed("stale claims", e)
+            return []
+
+    def acquire_lease(self, key: str, ttl_seconds: int) -> Optional[str]:
+        """SET NX lease; returns the owner token, or None if held elsewhere or Redis is unavailable"""
+        if not self.available:
+            return None
+        token = f"{os.getpid()}:{time.time_ns()}"
+        try:
+            self.round_trips += 1
+            acquired = self.redis_client.set(key, token, nx=True, ex=ttl_seconds)
+            self.breaker.record_success()
+            return token if acquired else None
+        except Exception as e:
+            self._failed("lease", e)
+            return None
+
+    _RELEASE_LEASE = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+
+    def release_lease(self, key: str, token: str) -> bool:
+        """Delete the lease only if this owner still holds it"""
+        if not self.available:
+            return False
+        try:
+            self.round_trips += 1
+            released = self.redis_client.eval(self._RELEASE_LEASE, 1, key, token)
+            self.breaker.record_success()
+            return bool(released)
+        except Exception as e:
+            self._failed("lease release", e)
+            return False
+
+    @staticmethod
+    def _parse_logout_time(raw: Optional[str]) -> Optional[datetime]:
+        if not raw:
+            return None
+        try:
+            return datetime.fromisoformat(json.loads(raw)["logged_out_at"])
         except Exception:
             return None
 
@@ -0,0 +1,244 @@
+# app/services/static_assets.py
+"""
+Fingerprinted, precompressed frontend assets.
+
+    python -m app.services.static_assets            # build public/dist
+    python -m app.services.static_assets --check    # exit 1 if public/dist is out of date
+
+The build copies public/styles and public/js to public/dist/assets under
+content-hashed names (base.css -> base.3f9c2a1b.css), writes .gz and .br
+siblings, and rewrites the /styles and /js references in every HTML page.
+The app serves /assets with Content-Encoding negotiation and immutable caching,
+and keeps the HTML pages in memory. Without a build, pages come from public/
+and reference the plain /styles and /js mounts as before.
+
+public/dist is committed: the Vercel Python build bundles the repository as is
+and has no build step, so rebuild and commit it with any change under public/.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+PUBLIC_DIR = "public"
+DIST_DIR = os.path.join(PUBLIC_DIR, "dist")
+ASSETS_DIR = os.path.join(DIST_DIR, "assets")
+MANIFEST_PATH = os.path.join(DIST_DIR, "manifest.json")
+ASSET_SOURCES = ("styles", "js")
+COMPRESSIBLE = (".css", ".js", ".html", ".svg", ".json")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Pages keep stable URLs, so browsers revalidate them (a 304 costs a few bytes)
+HTML_CACHE_CONTROL = "no-cache"
+
+_REFERENCE = re.compile(r'(?P<attr>href|src)="(?P<url>/(?:styles|js)/[^"?#]+)"')
+
+def fingerprint(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()[:8]
+
+def compress(content: bytes) -> Dict[str, bytes]:
+    """Encoded variants keyed by Content-Encoding, keeping only those that save bytes"""
+    variants = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(content, quality=11)
+    return {encoding: data for encoding, data in variants.items() if len(data) < len(content)}
+
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+def accepted_encodings(accept_encoding: str) -> List[str]:
+    """br and/or gzip in order of preference, if the Accept-Encoding header allows them (q > 0)"""
+    qualities = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name.strip().lower()] = quality
+    return [e for e in ENCODING_SUFFIXES if qualities.get(e, qualities.get("*", 0)) > 0]
+
+def negotiate(accept_encoding: str, available) -> Optional[str]:
+    return next((e for e in accepted_encodings(accept_encoding) if e in available), None)
+
+def rewrite_html(html: str, manifest: Dict[str, str]) -> str:
+    """Point /styles and /js references at their fingerprinted copies; unknown files are left alone"""
+    return _REFERENCE.sub(
+        lambda m: f'{m["attr"]}="{manifest.get(m["url"], m["url"])}"', html
+    )
+
+def _write_with_variants(path: str, content: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+    if path.endswith(COMPRESSIBLE):
+        for encoding, data in compress(content).items():
+            with open(path + ENCODING_SUFFIXES[encoding], "wb") as f:
+                f.write(data)
+
+def build(public_dir: str = PUBLIC_DIR) -> Dict[str, str]:
+    """Build public/dist from scratch and return the manifest of original -> fingerprinted URLs"""
+    dist_dir = os.path.join(public_dir, "dist")
+    shutil.rmtree(dist_dir, ignore_errors=True)
+    manifest: Dict[str, str] = {}
+    for source in ASSET_SOURCES:
+        for root, _, files in os.walk(os.path.join(public_dir, source)):
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                relative = os.path.relpath(path, public_dir).replace(os.sep, "/")
+                with open(path, "rb") as f:
+                    content = f.read()
+                stem, ext = os.path.splitext(relative)
+                hashed = f"{stem}.{fingerprint(content)}{ext}"
+                _write_with_variants(os.path.join(dist_dir, "assets", hashed), content)
+                manifest[f"/{relative}"] = f"/assets/{hashed}"
+    for name in sorted(os.listdir(public_dir)):
+        if name.endswith(".html"):
+            with open(os.path.join(public_dir, name), encoding="utf-8") as f:
+                html = rewrite_html(f.read(), manifest)
+            # Pages are compressed in memory at load time (HtmlPageCache)
+            with open(os.path.join(dist_dir, name), "w", encoding="utf-8") as f:
+                f.write(html)
+    with open(os.path.join(dist_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+def _tree_digest(directory: str) -> Dict[str, str]:
+    digest = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                digest[os.path.relpath(path, directory)] = fingerprint(f.read())
+    return digest
+
+def is_stale(public_dir: str = PUBLIC_DIR) -> bool:
+    """True if public/dist differs from what build() would write from the current sources"""
+    with tempfile.TemporaryDirectory() as scratch:
+        scratch_public = os.path.join(scratch, "public")
+        shutil.copytree(public_dir, scratch_public, ignore=shutil.ignore_patterns("dist"))
+        build(scratch_public)
+        return _tree_digest(os.path.join(scratch_public, "dist")) != _tree_digest(os.path.join(public_dir, "dist"))
+
+def is_built() -> bool:
+    return os.path.exists(MANIFEST_PATH)
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles for fingerprinted assets: serves the .br/.gz sibling the client
+    accepts with Content-Encoding, and marks every response immutable.
+    """
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = None
+        for encoding in accepted_encodings(Headers(scope=scope).get("accept-encoding", "")):
+            try:
+                response = await super().get_response(path + ENCODING_SUFFIXES[encoding], scope)
+            except HTTPException:
+                continue  # not compressed (too small or binary)
+            media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            if media_type.startswith("text/"):
+                media_type += "; charset=utf-8"
+            response.headers["Content-Type"] = media_type
+            response.headers["Content-Encoding"] = encoding
+            break
+        if response is None:
+            response = await super().get_response(path, scope)
+        response.headers["Vary"] = "Accept-Encoding"
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+@dataclass
+class CachedPage:
+    body: bytes
+    etag: str
+    variants: Dict[str, bytes] = field(default_factory=dict)
+
+class HtmlPageCache:
+    """HTML pages held in memory with their compressed variants; loaded on first request"""
+    def __init__(self, public_dir: str = PUBLIC_DIR):
+        self.public_dir = public_dir
+        self._pages: Optional[Dict[str, CachedPage]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def source_dir(self) -> str:
+        dist_dir = os.path.join(self.public_dir, "dist")
+        return dist_dir if os.path.exists(os.path.join(dist_dir, "manifest.json")) else self.public_dir
+
+    def _load(self) -> Dict[str, CachedPage]:
+        pages = {}
+        source_dir = self.source_dir
+        for name in os.listdir(source_dir):
+            if name.endswith(".html"):
+                with open(os.path.join(source_dir, name), "rb") as f:
+                    body = f.read()
+                pages[name] = CachedPage(body, f'"{fingerprint(body)}"', compress(body))
+        return pages
+
+    @property
+    def pages(self) -> Dict[str, CachedPage]:
+        if self._pages is None:
+            with self._lock:
+                if self._pages is None:
+                    self._pages = self._load()
+        return self._pages
+
+    def reload(self):
+        with self._lock:
+            self._pages = None
+
+    def response(self, filename: str, headers: Headers, status_code: int = 200) -> Optional[Response]:
+        """The page negotiated for these request headers, a 304, or None if there is no such page"""
+        page = self.pages.get(filename)
+        if page is None:
+            return None
+        response_headers = {"Vary": "Accept-Encoding"}
+        if status_code == 200:
+            response_headers.update({"ETag": page.etag, "Cache-Control": HTML_CACHE_CONTROL})
+            if headers.get("if-none-match") == page.etag:
+                return Response(status_code=304, headers=response_headers)
+        body = page.body
+        encoding = negotiate(headers.get("accept-encoding", ""), page.variants)
+        if encoding:
+            body = page.variants[encoding]
+            response_headers["Content-Encoding"] = encoding
+        return Response(body, status_code=status_code, media_type="text/html", headers=response_headers)
+
+html_pages = HtmlPageCache()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build fingerprinted, precompressed assets")
+    parser.add_argument("--check", action="store_true", help="verify public/dist is up to date instead of building")
+    args = parser.parse_args(argv)
+    if args.check:
+        if is_stale():
+            print(f"❌ {DIST_DIR} is out of date; run python -m app.services.static_assets and commit it")
+            sys.exit(1)
+        print(f"✅ {DIST_DIR} is up to date")
+        return
+    built = build()
+    print(f"✅ Built {len(built)} fingerprinted assets into {DIST_DIR}" + ("" if brotli else " (brotli not installed; gzip only)"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# app/services/transform_jobs.py
+
+from typing import Optional, Dict, Any, List, Tuple
+from app.config import settings
+from app.models.image import Image
+from app.services.redis_service import redis_service
+from app.services.async_redis import async_redis
+
+TRANSFORMATION_EFFECTS = {
+    "restore": "e_improve",
+    "remove_bg": "e_background_removal",
+    "remove_obj": "e_gen_remove",
+    "enhance": "e_auto_contrast,e_auto_brightness",
+    "generative_fill": "e_gen_fill",
+    "replace_bg": "e_gen_background_replace",
+}
+
+def derived_url(secure_url: str, transformation: str) -> str:
+    """Insert the transformation's effect into a Cloudinary delivery URL"""
+    url_parts = secure_url.split("/upload/")
+    if len(url_parts) != 2:
+        raise Exception("Invalid Cloudinary URL format")
+    return f"{url_parts[0]}/upload/{TRANSFORMATION_EFFECTS.get(transformation, '')}/{url_parts[1]}"
+
+def build_job(new_image: Image, source: Image, cost: int) -> Dict[str, Any]:
+    return {
+        "job_id": new_image.id,
+        "user_id": new_image.user_id,
+        "transformation": new_image.transformation_type,
+        # explicit() needs a real asset id; derived-of-derived sources only have a URL
+        "source_public_id": source.public_id if source.transformation_type is None else None,
+        "cost": cost,
+    }
+
+def enqueue_transformation(job: Dict[str, Any]) -> bool:
+    return redis_service.enqueue_json(settings.transform_queue, job)
+
+async def enqueue_transformation_async(job: Dict[str, Any]) -> bool:
+    return await async_redis.enqueue_json(settings.transform_queue, job)
+
+def processing_queue() -> str:
+    # Jobs a worker has claimed but not finished; see reap_stale_jobs in transform_worker
+    return f"{settings.transform_queue}:processing"
+
+def claim_transformation(timeout_seconds: int = 2) -> Optional[Tuple[str, Dict[str, Any]]]:
+    return redis_service.claim_json(settings.transform_queue, processing_queue(), timeout_seconds)
+
+def finish_transformation(raw: str) -> bool:
+    return redis_service.ack_json(processing_queue(), raw)
+
+def stale_transformations() -> List[Tuple[str, Dict[str, Any]]]:
+    return redis_service.stale_claims(processing_queue(), settings.transform_job_timeout_seconds)
@@ -0,0 +1,144 @@
+"""
+Transformation worker: materializes queued derived images so API workers never
+wait on slow AI effects.
+
+    python -m app.services.transform_worker                 # one worker process
+    python -m app.services.transform_worker --processes 4   # several
+
+Set TRANSFORM_WORKER_ENABLED=true on the API when these run. Jobs are claimed
+onto a processing list and only removed once handled; every worker also reaps
+jobs left there by a crashed one, re-queueing them up to
+TRANSFORM_MAX_ATTEMPTS times before failing them with a refund.
+"""
+import argparse
+import logging
+import multiprocessing
+import time
+from typing import Dict, Any
+import httpx
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.image import Image
+from app.models.user import User
+from app.billing.enforce import refund_credits
+from app.services.cloudinary_service import cloudinary_service
+from app.services.redis_service import redis_service
+from app.services.transform_jobs import (
+    TRANSFORMATION_EFFECTS, claim_transformation, finish_transformation, stale_transformations, enqueue_transformation,
+)
+from app.services.events import publish_user_event, job_payload
+from app.services.content_version import bump_content_version
+
+logger = logging.getLogger("ssnapify.transforms")
+
+REAP_INTERVAL_SECONDS = 60
+
+def fail_job(db: Session, image: Image, job: Dict[str, Any], error: str):
+    """Mark the job failed and refund its credits, in one commit"""
+    image.status = "failed"
+    image.error = error[:500]
+    user = db.get(User, job["user_id"])
+    if user and job.get("cost"):
+        refund_credits(user, db, job["cost"], job["transformation"], image.id)
+    db.commit()
+    bump_content_version(image.user_id)
+    publish_user_event(image.user_id, "job", job_payload(image))
+
+def process_job(job: Dict[str, Any]):
+    db = SessionLocal()
+    try:
+        image = db.get(Image, job["job_id"])
+        if image is None or image.status not in ("pending", "processing"):
+            return
+        image.status = "processing"
+        db.commit()
+        bump_content_version(image.user_id)
+        publish_user_event(image.user_id, "job", job_payload(image))
+        try:
+            effect = TRANSFORMATION_EFFECTS.get(job["transformation"], "")
+            if job.get("source_public_id"):
+                result = cloudinary_service.materialize_derived(job["source_public_id"], effect)
+                image.secure_url = result["eager"][0]["secure_url"]
+            else:
+                # No asset id to call explicit() on; fetching the URL makes Cloudinary render it
+                httpx.get(image.secure_url, timeout=120).raise_for_status()
+            image.status = "ready"
+            image.error = None
+            db.commit()
+            bump_content_version(image.user_id)
+            logger.info(f"Transformation job {image.id} ready")
+            publish_user_event(image.user_id, "job", job_payload(image))
+        except Exception as e:
+            logger.error(f"Transformation job {job['job_id']} failed: {e}")
+            db.rollback()
+            fail_job(db, image, job, str(e))
+    finally:
+        db.close()
+
+def reap_stale_jobs() -> int:
+    """
+    Recover jobs claimed longer than transform_job_timeout_seconds ago, i.e. by
+    a worker that died or hung: re-queue them, or fail and refund once they
+    have used up their attempts. Safe to run from every worker at once.
+    """
+    reaped = 0
+    for raw, job in stale_transformations():
+        if not finish_transformation(raw):
+            continue  # another worker reaped it first
+        reaped += 1
+        attempts = job.get("attempts", 1) + 1
+        if attempts <= settings.transform_max_attempts and enqueue_transformation({**job, "attempts": attempts}):
+            logger.warning(f"Re-queued stale transformation job {job['job_id']} (attempt {attempts})")
+            continue
+        logger.error(f"Giving up on transformation job {job['job_id']} after {attempts - 1} attempts")
+        db = SessionLocal()
+        try:
+            image = db.get(Image, job["job_id"])
+            if image is not None and image.status in ("pending", "processing"):
+                fail_job(db, image, job, "Transformation worker stopped before finishing the job")
+        finally:
+            db.close()
+    return reaped
+
+def run_worker():
+    logger.info("Transformation worker started")
+    next_reap = time.monotonic()
+    while True:
+        if time.monotonic() >= next_reap:
+            try:
+                reap_stale_jobs()
+            except Exception as e:
+                logger.error(f"Transformation reaper error: {e}")
+            next_reap = time.monotonic() + REAP_INTERVAL_SECONDS
+        claimed = claim_transformation()
+        if claimed is None:
+            if not redis_service.available:
+                time.sleep(1)  # breaker open or no Redis; don't spin
+            continue
+        raw, job = claimed
+        try:
+            process_job(job)
+        except Exception as e:
+            # Left on the processing list; the reaper retries it after the timeout
+            logger.error(f"Transformation worker error: {e}")
+            continue
+        finish_transformation(raw)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SSnapify transformation worker")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes to run")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.processes <= 1:
+        run_worker()
+        return
+    workers = [multiprocessing.Process(target=run_worker, daemon=True) for _ in range(args.processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+if __name__ == "__main__":
+    main()
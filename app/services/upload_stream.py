@@ -0,0 +1,97 @@
+# app/services/upload_stream.py
+
+import hashlib
+import os
+from typing import BinaryIO, Optional
+
+# Leading bytes of the formats the frontend accepts (see public/js/config.js)
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+SNIFF_BYTES = 16
+
+class UploadTooLarge(Exception):
+    """Raised as soon as a stream crosses its size cap"""
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        super().__init__(f"Upload exceeds the {max_bytes // (1024 * 1024)}MB limit")
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """Detect an image type from its first bytes"""
+    for signature, content_type in _SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+class CappedUploadStream:
+    """
+    File-like view over an uploaded (spooled) file that is read chunk by chunk.
+    Tracks length, content type and SHA-256 as bytes flow through and raises
+    UploadTooLarge the moment the read position passes max_bytes, so no more than
+    one chunk is ever held in memory. Unbounded reads raise ValueError.
+    """
+    def __init__(self, raw: BinaryIO, max_bytes: int, name: str = "stream", declared_type: Optional[str] = None):
+        self._raw = raw
+        self.max_bytes = max_bytes
+        self.name = name
+        self.declared_type = declared_type
+        self.sniffed_type: Optional[str] = None
+        self.length = 0
+        self._hasher = hashlib.sha256()
+        self._hashed_upto = 0
+        self._raw.seek(0)
+
+    @property
+    def content_type(self) -> Optional[str]:
+        return self.sniffed_type or self.declared_type
+
+    def hash_contents(self, chunk_size: int = 1024 * 1024) -> str:
+        """Read to EOF in chunks (enforcing the cap), rewind, and return the SHA-256 hex digest"""
+        self._raw.seek(self._hashed_upto)
+        while self.read(chunk_size):
+            pass
+        self._raw.seek(0)
+        return self.sha256
+
+    @property
+    def sha256(self) -> str:
+        return self._hasher.hexdigest()
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            # Never slurp the whole file; callers must read in bounded chunks
+            raise ValueError("CappedUploadStream.read needs a chunk size")
+        start = self._raw.tell()
+        chunk = self._raw.read(size)
+        if start == self._hashed_upto and chunk:
+            self._hasher.update(chunk)
+            self._hashed_upto += len(chunk)
+        position = self._raw.tell()
+        if position > self.length:
+            if self.length == 0 and chunk and self.sniffed_type is None:
+                self.sniffed_type = sniff_content_type(chunk[:SNIFF_BYTES])
+            self.length = position
+        if self.length > self.max_bytes:
+            raise UploadTooLarge(self.max_bytes)
+        return chunk
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self._raw.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._raw.tell()
+
+    def close(self):
+        # The underlying UploadFile is owned (and closed) by the framework.
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,181 @@
+# app/services/user_cache.py
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.session import make_transient_to_detached
+from app.config import settings
+from app.models.user import User
+from app.services.redis_service import redis_service
+from app.services.async_redis import async_redis
+
+# Everything auth and billing checks read; hashed_password is deliberately left out
+# and is lazily loaded if a caller ever touches it.
+PRINCIPAL_FIELDS = (
+    "id", "email", "username", "credit_balance", "plan_id",
+    "plan_started_at", "plan_expires_at", "billing_anchor_utc", "last_credit_reset_at",
+    "next_credit_reset_at", "is_active", "is_admin", "created_at", "updated_at",
+)
+_DATETIME_FIELDS = {
+    "plan_started_at", "plan_expires_at", "billing_anchor_utc",
+    "last_credit_reset_at", "next_credit_reset_at", "created_at", "updated_at",
+}
+
+# Session.info key collecting user ids to invalidate once the transaction commits
+_PENDING_KEY = "user_cache_pending_invalidations"
+
+def _key(user_id: int) -> str:
+    return f"user_principal:{user_id}"
+
+def _to_json(principal: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: (v.isoformat() if isinstance(v, datetime) else v) for k, v in principal.items()}
+
+def _from_json(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        k: (datetime.fromisoformat(v) if k in _DATETIME_FIELDS and v else v)
+        for k, v in data.items()
+    }
+
+class UserPrincipalCache:
+    """
+    Two-tier cache of authenticated user rows: a per-process TTL LRU in front of
+    an optional shared Redis tier. Billing writes call invalidate_on_commit();
+    other workers' LRU entries age out within the TTL.
+    """
+    def __init__(self, ttl_seconds: int, max_entries: int, use_redis: bool):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.use_redis = use_redis
+        self._entries: "OrderedDict[int, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self._pending_deletes = set()
+
+    def _get_local(self, user_id: int) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[user_id]
+        return None
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        principal = self._get_local(user_id)
+        if principal is None and self.use_redis:
+            principal = self._from_redis(user_id, redis_service.get_json(_key(user_id)))
+        if principal is None:
+            self.misses += 1
+        return principal
+
+    async def get_async(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """get() for request handlers; the Redis tier is read without blocking the loop"""
+        principal = self._get_local(user_id)
+        if principal is None and self.use_redis:
+            principal = self._from_redis(user_id, await async_redis.get_json(_key(user_id)))
+        if principal is None:
+            self.misses += 1
+        return principal
+
+    def _from_redis(self, user_id: int, data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if not data:
+            return None
+        principal = _from_json(data)
+        self._store_local(user_id, principal)
+        self.redis_hits += 1
+        return principal
+
+    def _principal(self, user: User) -> Dict[str, Any]:
+        principal = {field: getattr(user, field) for field in PRINCIPAL_FIELDS}
+        self._store_local(user.id, principal)
+        return principal
+
+    def put(self, user: User):
+        principal = self._principal(user)
+        if self.use_redis:
+            redis_service.set_json(_key(user.id), _to_json(principal), self.ttl_seconds)
+
+    async def put_async(self, user: User):
+        principal = self._principal(user)
+        if self.use_redis:
+            await async_redis.set_json(_key(user.id), _to_json(principal), self.ttl_seconds)
+
+    def invalidate(self, user_id: int):
+        self.invalidate_many([user_id])
+
+    def invalidate_on_commit(self, user: User):
+        """
+        Invalidate once the session holding user commits. Dropping the entry
+        before the commit would let a concurrent request re-cache the old row.
+        """
+        db = object_session(user)
+        if db is None:
+            self.invalidate(user.id)
+            return
+        db.info.setdefault(_PENDING_KEY, set()).add(user.id)
+
+    def invalidate_many(self, user_ids):
+        user_ids = list(user_ids)
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+        if self.use_redis and user_ids:
+            self._delete_shared([_key(user_id) for user_id in user_ids])
+
+    def _delete_shared(self, keys):
+        # Billing code calls invalidate() from sync helpers that request handlers run
+        # on the event loop (AsyncSession.run_sync); hand the delete to the asyncio
+        # client there instead of blocking the loop on a socket.
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            redis_service.delete(*keys)
+            return
+        task = loop.create_task(async_redis.delete(*keys))
+        self._pending_deletes.add(task)
+        task.add_done_callback(self._pending_deletes.discard)
+
+    def attach(self, db: Session, principal: Dict[str, Any]) -> User:
+        """Rebuild a persistent User in this session from cached fields without a SELECT"""
+        user = User(**principal)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    def _store_local(self, user_id: int, principal: Dict[str, Any]):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            size = len(self._entries)
+        return {"size": size, "hits": self.hits, "redis_hits": self.redis_hits, "misses": self.misses}
+
+user_cache = UserPrincipalCache(
+    ttl_seconds=settings.user_cache_ttl_seconds,
+    max_entries=settings.user_cache_max_entries,
+    use_redis=settings.user_cache_use_redis,
+)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session):
+    user_ids = session.info.pop(_PENDING_KEY, None)
+    if user_ids:
+        user_cache.invalidate_many(user_ids)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session):
+    # Nothing was written, so the cached rows are still current
+    session.info.pop(_PENDING_KEY, None)
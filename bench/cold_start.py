@@ -0,0 +1,120 @@
+"""
+Cold-start benchmark: what a fresh serverless instance pays before answering.
+
+    python -m bench.cold_start                    # 5 fresh processes, 1600ms over bare fastapi
+    python -m bench.cold_start --runs 10 --budget-ms 1200
+    python -m bench.cold_start --absolute --budget-ms 3000
+
+Each run starts a new interpreter that imports api.index (the Vercel entrypoint)
+and serves its first requests through the ASGI app, against local stand-ins: a
+throwaway SQLite file, no Redis and dummy Cloudinary/Google credentials, so any
+network I/O at import time shows up as a failure or a stall. Prints JSON and exits
+non-zero when the median import + first request time exceeds the budget.
+
+The budget is measured over a baseline: each run is paired with a fresh
+interpreter that only imports fastapi and its TestClient, and that time is
+subtracted. The framework import alone (mostly pydantic building
+fastapi.openapi.models) swings between about 0.9s and 1.6s across runs and
+machines; the app's own cost measured 985-1075ms median. The 1600ms default
+leaves about 50% headroom over that. --absolute budgets the raw total instead.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the fresh interpreter; timings start before the app is imported
+CHILD = r"""
+import json, time
+started = time.perf_counter()
+import api.index
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(api.index.app)
+statuses = [client.get(path).status_code for path in ("/index.html", "/users/me")]
+served = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_request_ms": (served - imported) * 1000,
+    "statuses": statuses,
+}))
+"""
+
+# Same interpreter start with only the framework: the floor the app cannot go below
+BASELINE_CHILD = r"""
+import json, time
+started = time.perf_counter()
+import fastapi
+from fastapi.testclient import TestClient
+print(json.dumps({"import_ms": (time.perf_counter() - started) * 1000}))
+"""
+
+def stand_in_env(db_path: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "SECRET_KEY": "bench", "ALGORITHM": "HS256",
+        "GOOGLE_CLIENT_ID": "bench", "GOOGLE_CLIENT_SECRET": "bench", "GOOGLE_REDIRECT_URL": "http://localhost/callback",
+        "CLOUDINARY_CLOUD_NAME": "bench", "CLOUDINARY_API_KEY": "bench", "CLOUDINARY_API_SECRET": "bench",
+        "REDIS_URL": "", "DATABASE_URL": f"sqlite:///{db_path}",
+        "POSTGRES_USER": "bench", "POSTGRES_PASSWORD": "bench", "POSTGRES_DATABASE": "bench",
+        "BILLING_SCHEDULER_IN_WEB": "false",
+        "PYTHONPATH": REPO_ROOT,
+    })
+    return env
+
+def run_once(env: dict, child: str = CHILD) -> dict:
+    spawned = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", child], cwd=REPO_ROOT, env=env,
+        capture_output=True, text=True, timeout=120,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"cold start run failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - spawned) * 1000
+    result["total_ms"] = result["import_ms"] + result.get("first_request_ms", 0)
+    return result
+
+def summarize(runs, key: str) -> dict:
+    values = sorted(run[key] for run in runs)
+    return {"median": round(statistics.median(values), 1), "min": round(values[0], 1), "max": round(values[-1], 1)}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="SSnapify cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1600.0, help="max median import + first request time over bare fastapi")
+    parser.add_argument("--absolute", action="store_true", help="budget the raw total, without subtracting the baseline")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = stand_in_env(os.path.join(tmp, "bench.sqlite"))
+        run_once(env)  # warm the OS file cache and .pyc files; not counted
+        runs, baselines = [], []
+        # Interleaved so machine noise hits both series alike
+        for _ in range(args.runs):
+            runs.append(run_once(env))
+            baselines.append(run_once(env, BASELINE_CHILD))
+    baseline_ms = summarize(baselines, "import_ms")
+    for run, baseline in zip(runs, baselines):
+        run["overhead_ms"] = run["total_ms"] - baseline["import_ms"]
+
+    report = {
+        "runs": args.runs,
+        "budget_ms": args.budget_ms,
+        "budgeted": "total_ms" if args.absolute else "overhead_ms",
+        "baseline_ms": baseline_ms,
+        **{key: summarize(runs, key) for key in ("import_ms", "first_request_ms", "total_ms", "overhead_ms", "process_ms")},
+        "statuses": runs[-1]["statuses"],
+    }
+    report["passed"] = report[report["budgeted"]]["median"] <= args.budget_ms
+    print(json.dumps(report, indent=2))
+    return 0 if report["passed"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Stand-in for the Cloudinary upload and admin APIs, for benchmarks and local runs.
+
+    python -m bench.fake_cloudinary --port 8765 --latency-ms 80 --jitter-ms 20
+
+Point the SDK at it with CLOUDINARY_UPLOAD_PREFIX=http://127.0.0.1:8765 (the SDK
+reads every CLOUDINARY_* variable when CLOUDINARY_CLOUD_NAME is set). Uploads,
+chunked uploads, destroy, explicit and resource lookups answer with the fields
+the app reads, after the injected latency; nothing is stored. Jitter is drawn
+from a seeded generator so runs repeat.
+"""
+import argparse
+import email
+import email.policy
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_ROUTE = re.compile(r"^/v1_1/(?P<cloud>[^/]+)/(?P<rest>.+)$")
+
+def form_fields(content_type: str, body: bytes) -> dict:
+    """Text fields of a multipart/form-data or urlencoded body; file parts are skipped"""
+    if content_type.startswith("multipart/form-data"):
+        message = email.message_from_bytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body, policy=email.policy.HTTP,
+        )
+        return {
+            part.get_param("name", header="content-disposition"): part.get_content()
+            for part in message.iter_parts()
+            if part.get_filename() is None
+        }
+    return {key: values[0] for key, values in parse_qs(body.decode()).items()}
+
+class FakeCloudinary:
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def delay(self):
+        with self._lock:
+            self.requests += 1
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        time.sleep(max(0.0, self.latency_ms + jitter) / 1000)
+
+    def asset(self, cloud: str, public_id: str, fmt: str = "png", size: int = 0) -> dict:
+        version = int(time.time())
+        return {
+            "public_id": public_id,
+            "version": version,
+            "signature": "0" * 40,
+            "resource_type": "image",
+            "type": "upload",
+            "format": fmt,
+            "bytes": size,
+            "width": 640,
+            "height": 480,
+            "secure_url": f"https://res.cloudinary.com/{cloud}/image/upload/v{version}/{public_id}.{fmt}",
+            "url": f"http://res.cloudinary.com/{cloud}/image/upload/v{version}/{public_id}.{fmt}",
+        }
+
+    def handle(self, method: str, path: str, fields: dict, size: int):
+        match = _ROUTE.match(urlparse(path).path)
+        if not match:
+            return 404, {"error": {"message": "not found"}}
+        cloud, rest = match["cloud"], match["rest"]
+        if method == "POST" and rest == "image/upload":
+            public_id = fields.get("public_id") or f"asset_{time.time_ns()}"
+            folder = fields.get("folder")
+            if folder and not public_id.startswith(folder + "/"):
+                public_id = f"{folder}/{public_id}"
+            return 200, self.asset(cloud, public_id, size=size)
+        if method == "POST" and rest == "image/destroy":
+            return 200, {"result": "ok"}
+        if method == "POST" and rest == "image/explicit":
+            result = self.asset(cloud, fields.get("public_id", "asset"))
+            result["eager"] = [{"transformation": fields.get("eager", ""), "secure_url": result["secure_url"]}]
+            return 200, result
+        if method == "GET" and rest.startswith("resources/image/upload/"):
+            return 200, self.asset(cloud, rest[len("resources/image/upload/"):])
+        return 404, {"error": {"message": f"unsupported: {method} {rest}"}}
+
+def make_handler(fake: FakeCloudinary):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _respond(self, method: str):
+            length = int(self.headers.get("content-length") or 0)
+            body = self.rfile.read(length) if length else b""
+            fields = form_fields(self.headers.get("content-type", ""), body) if body else {}
+            fake.delay()
+            status, payload = fake.handle(method, self.path, fields, len(body))
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._respond("GET")
+
+        def do_POST(self):
+            self._respond("POST")
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+def serve(port: int, latency_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 0) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(FakeCloudinary(latency_ms, jitter_ms, seed)))
+    server.daemon_threads = True
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake Cloudinary API server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="injected delay per API call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform +/- jitter around the delay")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    server = serve(args.port, args.latency_ms, args.jitter_ms, args.seed)
+    print(f"Fake Cloudinary on http://127.0.0.1:{server.server_port} ({args.latency_ms}±{args.jitter_ms}ms)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,477 @@
+// Core API and Utility Functions
+class Core {
+    constructor() {
+        this.baseURL = window.location.origin;
+        this.tokenKey = 'access_token';
+        this.userKey = 'user_data';
+        this.token = localStorage.getItem(this.tokenKey);
+        this.user = null;
+        this.init();
+    }
+
+    init() {
+        this.loadUser();
+        this.handleTokenFromURL();
+    }
+
+    // Token Management
+    setToken(token) {
+        this.token = token;
+        localStorage.setItem(this.tokenKey, token);
+    }
+
+    getToken() {
+        return this.token || localStorage.getItem(this.tokenKey);
+    }
+
+    removeToken() {
+        this.token = null;
+        this.user = null;
+        localStorage.removeItem(this.tokenKey);
+        localStorage.removeItem(this.userKey);
+    }
+
+    // User Management
+    loadUser() {
+        const userData = localStorage.getItem(this.userKey);
+        this.user = userData ? JSON.parse(userData) : null;
+    }
+
+    saveUser(userData) {
+        this.user = userData;
+        localStorage.setItem(this.userKey, JSON.stringify(userData));
+    }
+
+    // Handle token from URL
+    handleTokenFromURL() {
+        const urlParams = new URLSearchParams(window.location.search);
+        const token = urlParams.get('token');
+        
+        if (token) {
+            console.log('Token found in URL, saving...');
+            this.setToken(token);
+            // Clean URL
+            window.history.replaceState({}, document.title, window.location.pathname);
+            // Fetch user data
+            this.fetchUserData();
+        }
+    }
+
+    // Auth Check
+    isAuthenticated() {
+        return !!this.getToken();
+    }
+
+    requireAuth() {
+        if (!this.isAuthenticated()) {
+            window.location.href = '/login.html';
+            return false;
+        }
+        return true;
+    }
+
+    // API Calls
+    // Update this in your core.js
+// In your core.js file, make sure this is correct:
+async apiCall(endpoint, options = {}) {
+    const url = endpoint.startsWith('http') ? endpoint : `${this.baseURL}${endpoint}`;
+    
+    const defaultHeaders = {};
+    
+    // CRITICAL: Only set JSON content-type if body is NOT FormData
+    if (options.body && !(options.body instanceof FormData)) {
+        defaultHeaders['Content-Type'] = 'application/json';
+    }
+    
+    // Always add auth header if available
+    if (this.getToken()) {
+        defaultHeaders['Authorization'] = `Bearer ${this.getToken()}`;
+    }
+
+    const finalOptions = {
+        ...options,
+        headers: {
+            ...defaultHeaders,
+            ...options.headers
+        }
+    };
+
+    console.log('🌐 API Call:', {
+        method: finalOptions.method || 'GET',
+        url: url,
+        headers: finalOptions.headers,
+        bodyType: finalOptions.body ? finalOptions.body.constructor.name : 'none'
+    });
+
+    try {
+        const response = await fetch(url, finalOptions);
+        
+        if (response.status === 401) {
+            console.warn('🔒 Unauthorized - removing token');
+            this.removeToken();
+            window.location.href = '/login.html';
+            return null;
+        }
+
+        return response;
+    } catch (error) {
+        console.error('💥 API call failed:', error);
+        throw error;
+    }
+}
+
+
+    // User Data
+    async fetchUserData() {
+        try {
+            const response = await this.apiCall('/users/me');
+            if (response && response.ok) {
+                const userData = await response.json();
+                this.saveUser(userData);
+                this.updateAuthUI();
+                
+                // Redirect to dashboard if on login page
+                if (window.location.pathname.includes('login.html')) {
+                    setTimeout(() => {
+                        window.location.href = '/dashboard.html';
+                    }, 1000);
+                }
+            }
+        } catch (error) {
+            console.error('Failed to fetch user data:', error);
+        }
+    }
+
+    async getCredits() {
+        try {
+            const response = await this.apiCall('/account/credits');
+            return response ? await response.json() : null;
+        } catch (error) {
+            console.error('Failed to get credits:', error);
+            return null;
+        }
+    }
+
+    async getUserImages(params = {}) {
+        const page = await this.getUserImagesPage(params);
+        return page.images;
+    }
+
+    // Images plus the pagination cursor and per-type counts sent as headers
+    async getUserImagesPage(params = {}) {
+        try {
+            const queryString = new URLSearchParams(params).toString();
+            const endpoint = `/images/${queryString ? '?' + queryString : ''}`;
+            const response = await this.apiCall(endpoint);
+            if (!response) return { images: [], nextCursor: null, counts: null };
+            const counts = response.headers.get('X-Image-Counts');
+            return {
+                images: await response.json(),
+                nextCursor: response.headers.get('X-Next-Cursor'),
+                counts: counts ? JSON.parse(counts) : null
+            };
+        } catch (error) {
+            console.error('Failed to get images:', error);
+            return { images: [], nextCursor: null, counts: null };
+        }
+    }
+
+    // Upload Image: straight to Cloudinary with a signature from the API, so image
+    // bytes never pass through the API workers. Falls back to the API upload only
+    // when no signature can be obtained.
+    async uploadImage(file, title = null) {
+        let params;
+        try {
+            const response = await this.apiCall('/images/upload-signature', { method: 'POST' });
+            if (!response || !response.ok) throw new Error('Upload signature unavailable');
+            params = await response.json();
+        } catch (error) {
+            console.warn('Direct upload unavailable, uploading through the API:', error);
+            return this.uploadImageViaApi(file, title);
+        }
+        return this.uploadImageDirect(file, title, params);
+    }
+
+    async uploadImageDirect(file, title, params) {
+        const formData = new FormData();
+        formData.append('file', file);
+        ['api_key', 'timestamp', 'folder', 'allowed_formats', 'signature'].forEach(key => {
+            formData.append(key, params[key]);
+        });
+
+        // Plain fetch: Cloudinary must not receive our bearer token
+        const uploadResponse = await fetch(params.upload_url, { method: 'POST', body: formData });
+        const uploaded = await uploadResponse.json();
+        if (!uploadResponse.ok) {
+            throw new Error((uploaded.error && uploaded.error.message) || 'Upload to Cloudinary failed');
+        }
+
+        const response = await this.apiCall('/images/finalize', {
+            method: 'POST',
+            body: JSON.stringify({
+                public_id: uploaded.public_id,
+                version: uploaded.version,
+                signature: uploaded.signature,
+                format: uploaded.format,
+                title: title || file.name
+            })
+        });
+        if (!response || !response.ok) throw new Error('Failed to save uploaded image');
+        return response.json();
+    }
+
+    async uploadImageViaApi(file, title = null) {
+        try {
+            const formData = new FormData();
+            formData.append('file', file);
+            if (title) formData.append('title', title);
+
+            const response = await this.apiCall('/images/', {
+                method: 'POST',
+                body: formData,
+                headers: {
+                    'Authorization': `Bearer ${this.getToken()}`
+                    // Don't set Content-Type for FormData
+                }
+            });
+
+            return response ? await response.json() : null;
+        } catch (error) {
+            console.error('Upload failed:', error);
+            throw error;
+        }
+    }
+
+    // Shared Server-Sent Events stream of upload/job updates. EventSource can't send
+    // headers, so each connection is opened with a single-use ticket, never the token.
+    async openEventStream() {
+        if (this.eventSource || !window.EventSource || !this.getToken()) return this.eventSource || null;
+        if (!this.eventSourceOpening) {
+            this.eventSourceOpening = this.connectEventStream().finally(() => {
+                this.eventSourceOpening = null;
+            });
+        }
+        return this.eventSourceOpening;
+    }
+
+    async connectEventStream() {
+        try {
+            const response = await this.apiCall('/images/events/ticket', { method: 'POST' });
+            if (!response || !response.ok) return null;
+            const { ticket } = await response.json();
+            this.eventSource = new EventSource(`/images/events?ticket=${encodeURIComponent(ticket)}`);
+        } catch (error) {
+            console.warn('Live updates unavailable:', error);
+            return null;
+        }
+        this.eventSource.addEventListener('error', () => {
+            // 503 (no Redis), or a reconnect with the spent ticket: stop and let callers fall
+            // back; the next openEventStream() fetches a fresh ticket
+            if (this.eventSource && this.eventSource.readyState === EventSource.CLOSED) {
+                this.eventSource = null;
+            }
+        });
+        return this.eventSource;
+    }
+
+    async fetchJob(jobId) {
+        const response = await this.apiCall(`/images/jobs/${jobId}`);
+        if (!response || !response.ok) throw new Error('Failed to check transformation status');
+        return response.json();
+    }
+
+    // Wait for a transformation job to finish; resolves with the derived image
+    async waitForJob(job, { timeoutMs = 180000, fallbackCheckMs = 15000 } = {}) {
+        const isDone = (j) => j.status === 'ready' || j.status === 'failed';
+        const source = isDone(job) ? null : await this.openEventStream();
+        return new Promise((resolve, reject) => {
+            let settled = false;
+            let fallbackTimer = null;
+            let timeoutTimer = null;
+
+            const finish = (result) => {
+                if (settled) return;
+                settled = true;
+                clearInterval(fallbackTimer);
+                clearTimeout(timeoutTimer);
+                if (source) {
+                    source.removeEventListener('job', onEvent);
+                    source.removeEventListener('open', check);
+                }
+                if (result.status === 'failed') {
+                    reject(new Error(result.error || 'Transformation failed'));
+                } else {
+                    resolve(result.image);
+                }
+            };
+            const check = async () => {
+                try {
+                    const latest = await this.fetchJob(job.job_id);
+                    if (isDone(latest)) finish(latest);
+                } catch (error) {
+                    console.warn('Job status check failed:', error);
+                }
+            };
+            const onEvent = (e) => {
+                const data = JSON.parse(e.data);
+                if (data.job_id === job.job_id && isDone(data)) finish(data);
+            };
+
+            if (isDone(job)) return finish(job);
+            if (source) {
+                source.addEventListener('job', onEvent);
+                // Catch a completion published before the stream was subscribed
+                source.addEventListener('open', check);
+                if (source.readyState === EventSource.OPEN) check();
+            }
+            // Slow safety net for dropped streams; a tight poll only without EventSource
+            fallbackTimer = setInterval(check, source ? fallbackCheckMs : 2000);
+            timeoutTimer = setTimeout(() => {
+                if (settled) return;
+                settled = true;
+                clearInterval(fallbackTimer);
+                reject(new Error('Transformation is taking too long'));
+            }, timeoutMs);
+        });
+    }
+
+    // Logout
+    async logout() {
+        try {
+            if (this.getToken()) {
+                await this.apiCall('/auth/logout', { method: 'POST' });
+            }
+        } catch (error) {
+            console.warn('Server logout failed:', error);
+        } finally {
+            this.removeToken();
+            this.updateAuthUI();
+            window.location.href = '/index.html';
+        }
+    }
+
+    // Update Auth UI
+    updateAuthUI() {
+        const isAuth = this.isAuthenticated();
+        
+        // Navigation elements
+        const navAuth = document.getElementById('navAuth');
+        const navUser = document.getElementById('navUser');
+        
+        if (navAuth) navAuth.style.display = isAuth ? 'none' : 'flex';
+        if (navUser) navUser.style.display = isAuth ? 'block' : 'none';
+        
+        // User info
+        if (isAuth && this.user) {
+            const userNameElements = document.querySelectorAll('#userName, #userNameDisplay');
+            userNameElements.forEach(el => {
+                if (el) el.textContent = this.user.username || this.user.email.split('@')[0];
+            });
+            
+            // Update credits
+            this.updateCreditsDisplay();
+        }
+    }
+
+    async updateCreditsDisplay() {
+        try {
+            const credits = await this.getCredits();
+            if (credits) {
+                const creditElements = document.querySelectorAll('#userCredits');
+                creditElements.forEach(el => {
+                    if (el) el.textContent = `${credits.credit_balance} Credits`;
+                });
+            }
+        } catch (error) {
+            console.error('Failed to update credits:', error);
+        }
+    }
+
+    // Utility Functions
+    showToast(message, type = 'info') {
+        const toast = document.createElement('div');
+        toast.className = `toast toast-${type}`;
+        toast.textContent = message;
+        
+        toast.style.cssText = `
+            position: fixed;
+            top: 20px;
+            right: 20px;
+            padding: 1rem 1.5rem;
+            border-radius: 0.5rem;
+            color: white;
+            font-weight: 500;
+            z-index: 1000;
+            background: ${type === 'error' ? '#ef4444' : type === 'success' ? '#10b981' : '#3b82f6'};
+        `;
+        
+        document.body.appendChild(toast);
+        
+        setTimeout(() => {
+            toast.remove();
+        }, 3000);
+    }
+
+    formatFileSize(bytes) {
+        if (bytes === 0) return '0 Bytes';
+        const k = 1024;
+        const sizes = ['Bytes', 'KB', 'MB', 'GB'];
+        const i = Math.floor(Math.log(bytes) / Math.log(k));
+        return parseFloat((bytes / Math.pow(k, i)).toFixed(2)) + ' ' + sizes[i];
+    }
+
+    validateFile(file) {
+        const maxSize = 10 * 1024 * 1024; // 10MB
+        const allowedTypes = ['image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/webp'];
+        
+        const errors = [];
+        
+        if (!allowedTypes.includes(file.type)) {
+            errors.push(`Unsupported file type: ${file.type}`);
+        }
+        
+        if (file.size > maxSize) {
+            errors.push(`File too large: ${this.formatFileSize(file.size)} (max: 10MB)`);
+        }
+        
+        return {
+            valid: errors.length === 0,
+            errors
+        };
+    }
+}
+
+// Initialize Core
+window.core = new Core();
+
+// Setup global event listeners
+document.addEventListener('DOMContentLoaded', () => {
+    // Update auth UI
+    core.updateAuthUI();
+    
+    // Setup dropdown toggles
+    const userBtn = document.getElementById('userBtn');
+    const dropdown = document.querySelector('.user-dropdown');
+    
+    if (userBtn && dropdown) {
+        userBtn.addEventListener('click', (e) => {
+            e.stopPropagation();
+            dropdown.classList.toggle('active');
+        });
+        
+        document.addEventListener('click', (e) => {
+            if (!dropdown.contains(e.target)) {
+                dropdown.classList.remove('active');
+            }
+        });
+    }
+    
+    // Setup logout buttons
+    const logoutBtns = document.querySelectorAll('.logout-btn');
+    logoutBtns.forEach(btn => {
+        btn.addEventListener('click', (e) => {
+            e.preventDefault();
+            core.logout();
+        });
+    });
+});
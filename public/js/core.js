@@ -153,19 +153,74 @@ async apiCall(endpoint, options = {}) {
     }
 
     async getUserImages(params = {}) {
+        const page = await this.getUserImagesPage(params);
+        return page.images;
+    }
+
+    // Images plus the pagination cursor and per-type counts sent as headers
+    async getUserImagesPage(params = {}) {
         try {
             const queryString = new URLSearchParams(params).toString();
             const endpoint = `/images/${queryString ? '?' + queryString : ''}`;
             const response = await this.apiCall(endpoint);
-            return response ? await response.json() : [];
+            if (!response) return { images: [], nextCursor: null, counts: null };
+            const counts = response.headers.get('X-Image-Counts');
+            return {
+                images: await response.json(),
+                nextCursor: response.headers.get('X-Next-Cursor'),
+                counts: counts ? JSON.parse(counts) : null
+            };
         } catch (error) {
             console.error('Failed to get images:', error);
-            return [];
+            return { images: [], nextCursor: null, counts: null };
         }
     }
 
-    // Upload Image
+    // Upload Image: straight to Cloudinary with a signature from the API, so image
+    // bytes never pass through the API workers. Falls back to the API upload only
+    // when no signature can be obtained.
     async uploadImage(file, title = null) {
+        let params;
+        try {
+            const response = await this.apiCall('/images/upload-signature', { method: 'POST' });
+            if (!response || !response.ok) throw new Error('Upload signature unavailable');
+            params = await response.json();
+        } catch (error) {
+            console.warn('Direct upload unavailable, uploading through the API:', error);
+            return this.uploadImageViaApi(file, title);
+        }
+        return this.uploadImageDirect(file, title, params);
+    }
+
+    async uploadImageDirect(file, title, params) {
+        const formData = new FormData();
+        formData.append('file', file);
+        ['api_key', 'timestamp', 'folder', 'allowed_formats', 'signature'].forEach(key => {
+            formData.append(key, params[key]);
+        });
+
+        // Plain fetch: Cloudinary must not receive our bearer token
+        const uploadResponse = await fetch(params.upload_url, { method: 'POST', body: formData });
+        const uploaded = await uploadResponse.json();
+        if (!uploadResponse.ok) {
+            throw new Error((uploaded.error && uploaded.error.message) || 'Upload to Cloudinary failed');
+        }
+
+        const response = await this.apiCall('/images/finalize', {
+            method: 'POST',
+            body: JSON.stringify({
+                public_id: uploaded.public_id,
+                version: uploaded.version,
+                signature: uploaded.signature,
+                format: uploaded.format,
+                title: title || file.name
+            })
+        });
+        if (!response || !response.ok) throw new Error('Failed to save uploaded image');
+        return response.json();
+    }
+
+    async uploadImageViaApi(file, title = null) {
         try {
             const formData = new FormData();
             formData.append('file', file);
@@ -187,6 +242,99 @@ async apiCall(endpoint, options = {}) {
         }
     }
 
+    // Shared Server-Sent Events stream of upload/job updates. EventSource can't send
+    // headers, so each connection is opened with a single-use ticket, never the token.
+    async openEventStream() {
+        if (this.eventSource || !window.EventSource || !this.getToken()) return this.eventSource || null;
+        if (!this.eventSourceOpening) {
+            this.eventSourceOpening = this.connectEventStream().finally(() => {
+                this.eventSourceOpening = null;
+            });
+        }
+        return this.eventSourceOpening;
+    }
+
+    async connectEventStream() {
+        try {
+            const response = await this.apiCall('/images/events/ticket', { method: 'POST' });
+            if (!response || !response.ok) return null;
+            const { ticket } = await response.json();
+            this.eventSource = new EventSource(`/images/events?ticket=${encodeURIComponent(ticket)}`);
+        } catch (error) {
+            console.warn('Live updates unavailable:', error);
+            return null;
+        }
+        this.eventSource.addEventListener('error', () => {
+            // 503 (no Redis), or a reconnect with the spent ticket: stop and let callers fall
+            // back; the next openEventStream() fetches a fresh ticket
+            if (this.eventSource && this.eventSource.readyState === EventSource.CLOSED) {
+                this.eventSource = null;
+            }
+        });
+        return this.eventSource;
+    }
+
+    async fetchJob(jobId) {
+        const response = await this.apiCall(`/images/jobs/${jobId}`);
+        if (!response || !response.ok) throw new Error('Failed to check transformation status');
+        return response.json();
+    }
+
+    // Wait for a transformation job to finish; resolves with the derived image
+    async waitForJob(job, { timeoutMs = 180000, fallbackCheckMs = 15000 } = {}) {
+        const isDone = (j) => j.status === 'ready' || j.status === 'failed';
+        const source = isDone(job) ? null : await this.openEventStream();
+        return new Promise((resolve, reject) => {
+            let settled = false;
+            let fallbackTimer = null;
+            let timeoutTimer = null;
+
+            const finish = (result) => {
+                if (settled) return;
+                settled = true;
+                clearInterval(fallbackTimer);
+                clearTimeout(timeoutTimer);
+                if (source) {
+                    source.removeEventListener('job', onEvent);
+                    source.removeEventListener('open', check);
+                }
+                if (result.status === 'failed') {
+                    reject(new Error(result.error || 'Transformation failed'));
+                } else {
+                    resolve(result.image);
+                }
+            };
+            const check = async () => {
+                try {
+                    const latest = await this.fetchJob(job.job_id);
+                    if (isDone(latest)) finish(latest);
+                } catch (error) {
+                    console.warn('Job status check failed:', error);
+                }
+            };
+            const onEvent = (e) => {
+                const data = JSON.parse(e.data);
+                if (data.job_id === job.job_id && isDone(data)) finish(data);
+            };
+
+            if (isDone(job)) return finish(job);
+            if (source) {
+                source.addEventListener('job', onEvent);
+                // Catch a completion published before the stream was subscribed
+                source.addEventListener('open', check);
+                if (source.readyState === EventSource.OPEN) check();
+            }
+            // Slow safety net for dropped streams; a tight poll only without EventSource
+            fallbackTimer = setInterval(check, source ? fallbackCheckMs : 2000);
+            timeoutTimer = setTimeout(() => {
+                if (settled) return;
+                settled = true;
+                clearInterval(fallbackTimer);
+                reject(new Error('Transformation is taking too long'));
+            }, timeoutMs);
+        });
+    }
+
     // Logout
     async logout() {
         try {
@@ -87,7 +87,7 @@ function updateRecentImages(images) {
     const imagesHTML = images.map(image => `
         <div class="image-card" onclick="window.location.href='/gallery.html'">
             <div class="image-thumbnail">
-                <img src="${image.secure_url}" alt="${image.title}" loading="lazy">
+                <img src="${(image.variants && image.variants.thumb) || image.secure_url}" alt="${image.title}" loading="lazy" decoding="async">
                 <div class="image-overlay">
                     <span class="image-type">${formatTransformationType(image.transformation_type)}</span>
                 </div>
@@ -54,14 +54,16 @@ async function loadImages() {
     try {
         showLoadingState();
 
-        const params = { limit: 50 };
+        const params = { limit: 50, include_counts: true };
         
         // Add filter if not 'all'
         if (currentFilter !== 'all') {
-            params.transformation_type = currentFilter === '' ? null : currentFilter;
+            params.transformation_type = currentFilter === '' ? 'original' : currentFilter;
         }
 
-        images = await core.getUserImages(params);
+        const page = await core.getUserImagesPage(params);
+        images = page.images;
+        if (page.counts) updateFilterCounts(page.counts);
         displayImages();
         hideLoadingState();
 
@@ -72,6 +74,19 @@ async function loadImages() {
     }
 }
 
+function updateFilterCounts(counts) {
+    const filterSelect = document.getElementById('filterSelect');
+    if (!filterSelect) return;
+
+    const total = Object.values(counts).reduce((sum, n) => sum + n, 0);
+    Array.from(filterSelect.options).forEach(option => {
+        if (!option.dataset.label) option.dataset.label = option.textContent;
+        const key = option.value === 'all' ? null : (option.value || 'original');
+        const count = key === null ? total : (counts[key] || 0);
+        option.textContent = `${option.dataset.label} (${count})`;
+    });
+}
+
 function displayImages() {
     const galleryGrid = document.getElementById('galleryGrid');
     const emptyState = document.getElementById('emptyState');
@@ -96,11 +111,15 @@ function displayImages() {
 function createImageHTML(image) {
     const transformationType = formatTransformationType(image.transformation_type);
     const formattedDate = formatDate(image.created_at);
+    const variants = image.variants || {};
 
     return `
         <div class="gallery-item" data-id="${image.id}">
             <div class="image-container">
-                <img src="${image.secure_url}" alt="${image.title}" loading="lazy">
+                <img src="${variants.thumb || image.secure_url}"
+                     srcset="${variants.thumb || image.secure_url} 320w, ${variants.medium || image.secure_url} 800w"
+                     sizes="(max-width: 640px) 100vw, 320px"
+                     alt="${image.title}" loading="lazy" decoding="async">
                 <div class="image-overlay">
                     <div class="overlay-content">
                         <button class="btn btn-primary btn-sm view-btn" onclick="viewImage(${image.id})">
@@ -177,7 +196,7 @@ function viewImage(imageId) {
         modal.style.display = 'flex';
     }
     
-    if (modalImg) modalImg.src = image.secure_url;
+    if (modalImg) modalImg.src = (image.variants && image.variants.full) || image.secure_url;
     if (modalTitle) modalTitle.textContent = image.title;
     if (modalType) modalType.textContent = formatTransformationType(image.transformation_type);
     if (modalDate) modalDate.textContent = formatDate(image.created_at);
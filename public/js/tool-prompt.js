@@ -317,7 +317,8 @@ async function applyTransformationWithPrompt(imageId, prompt) {
             throw new Error(`Transformation failed: ${errorText}`);
         }
 
-        return await response.json();
+        const job = await response.json();
+        return await core.waitForJob(job);
     } catch (error) {
         console.error('Transformation error:', error);
         throw error;
@@ -289,7 +289,9 @@ async function applyTransformation(imageId) {
             throw new Error(errorMessage);
         }
 
-        const result = await response.json();
+        const job = await response.json();
+        console.log('Transformation queued:', job);
+        const result = await core.waitForJob(job);
         console.log('Transformation success:', result);
         return result;
 
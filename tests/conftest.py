@@ -0,0 +1,12 @@
+import os
+import tempfile
+
+# Settings are read at import, so every test module shares this environment and database
+_DB_DIR = tempfile.mkdtemp()
+os.environ.update(
+    SECRET_KEY="test", GOOGLE_CLIENT_ID="test", GOOGLE_CLIENT_SECRET="test", GOOGLE_REDIRECT_URL="http://testserver/callback",
+    CLOUDINARY_CLOUD_NAME="test", CLOUDINARY_API_KEY="test", CLOUDINARY_API_SECRET="test",
+    POSTGRES_USER="test", POSTGRES_PASSWORD="test", POSTGRES_DATABASE="test",
+    DATABASE_URL=f"sqlite:///{_DB_DIR}/test.sqlite", REDIS_URL="", USER_CACHE_USE_REDIS="false",
+    BILLING_SCHEDULER_IN_WEB="false", DB_PROFILE="test",
+)
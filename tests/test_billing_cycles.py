@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+
+import pytest
+from app.billing.resets import compute_paid_cycle_end, compute_paid_cycle_start, paid_cycle_months
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+@pytest.mark.parametrize("year, february_end", [(2025, 28), (2024, 29)])
+@pytest.mark.parametrize("anchor_day", [29, 30, 31])
+def test_month_end_anchor_across_february(anchor_day, year, february_end):
+    anchor = utc(year, 1, anchor_day, 9, 30)
+    clamped_day = min(anchor_day, february_end)
+
+    # Still in the first cycle until the clamped February boundary
+    assert paid_cycle_months(anchor, utc(year, 2, clamped_day, 9, 29)) == 0
+    assert compute_paid_cycle_end(anchor, utc(year, 2, clamped_day, 9, 29)) == utc(year, 2, clamped_day, 9, 30)
+
+    # On the boundary the second cycle starts; it ends on the anchor day, not the clamped one
+    assert paid_cycle_months(anchor, utc(year, 2, clamped_day, 9, 30)) == 1
+    assert compute_paid_cycle_start(anchor, utc(year, 3, 1)) == utc(year, 2, clamped_day, 9, 30)
+    assert compute_paid_cycle_end(anchor, utc(year, 3, 1)) == utc(year, 3, anchor_day, 9, 30)
+
+    # Months later the boundary is still measured from the anchor
+    assert paid_cycle_months(anchor, utc(year, 7, 1)) == 5
+    assert compute_paid_cycle_end(anchor, utc(year, 7, 1)) == utc(year, 7, anchor_day, 9, 30)
+
+def test_cycle_before_anchor_is_the_first():
+    anchor = utc(2025, 1, 31)
+    assert paid_cycle_months(anchor, utc(2025, 1, 15)) == 0
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+from app import models
+from app.billing.enforce import ensure_credits_or_admin, refund_credits
+from app.billing.ledger import reconstruct_balance, record_entry
+from app.billing.resets import apply_due_billing
+from app.billing.timeutils import now_utc
+from app.database import SessionLocal, engine
+
+@pytest.fixture
+def db():
+    models.Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+
+def make_user(db, email, balance):
+    current = now_utc()
+    user = models.User(
+        email=email, username=email.split("@")[0], hashed_password="", credit_balance=balance,
+        last_credit_reset_at=current, next_credit_reset_at=current + timedelta(days=30),
+    )
+    db.add(user); db.flush()
+    record_entry(db, user.id, balance, balance, "signup_grant")
+    db.commit()
+    return user
+
+def test_debit_below_cost_is_rejected(db):
+    user = make_user(db, "short@example.com", 2)
+    with pytest.raises(HTTPException) as exc:
+        ensure_credits_or_admin(user, db, 5, "enhance")
+    assert exc.value.status_code == 402
+    db.rollback()
+    db.refresh(user)
+    assert user.credit_balance == 2
+    assert reconstruct_balance(db, user.id) == 2
+
+def test_ledger_replays_to_balance(db):
+    user = make_user(db, "ledger@example.com", 10)
+
+    ensure_credits_or_admin(user, db, 4, "enhance"); db.commit()
+    assert user.credit_balance == 6
+    assert reconstruct_balance(db, user.id) == 6
+
+    refund_credits(user, db, 1, "enhance"); db.commit()
+    assert user.credit_balance == 7
+    assert reconstruct_balance(db, user.id) == 7
+
+    # Make the monthly reset due and let the request-time path apply it
+    last_month = now_utc() - timedelta(days=40)
+    db.execute(
+        update(models.User)
+        .where(models.User.id == user.id)
+        .values(last_credit_reset_at=last_month, next_credit_reset_at=now_utc() - timedelta(seconds=1))
+    )
+    db.commit()
+    assert apply_due_billing(user, now_utc())
+    db.commit()
+    db.refresh(user)
+    assert user.credit_balance == 10
+    assert reconstruct_balance(db, user.id) == 10
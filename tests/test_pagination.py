@@ -0,0 +1,38 @@
+import pytest
+from fastapi.testclient import TestClient
+from app import models
+from app.auth.security import create_access_token
+from app.database import SessionLocal, engine
+from app.main import app
+
+@pytest.fixture(scope="module")
+def client():
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = models.User(email="pages@example.com", username="pages", hashed_password="")
+    db.add(user); db.commit()
+    # created_at comes from the server default, so on SQLite every row shares one second
+    db.add_all(
+        models.Image(user_id=user.id, public_id=f"p{i}", secure_url=f"https://res.cloudinary.com/test/image/upload/v1/p{i}.jpg")
+        for i in range(5)
+    )
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    db.close()
+    with TestClient(app, headers=headers) as client:
+        yield client
+
+def test_cursor_pages_through_every_image_once(client):
+    pages, cursor = [], None
+    # Bounded: a cursor that does not advance would otherwise page forever
+    for _ in range(5):
+        response = client.get("/images/", params={"limit": 2, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        pages.append([image["id"] for image in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert pages == [[5, 4], [3, 2], [1]]
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/images/", params={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from app import models
+from app.billing.ledger import reconstruct_balance, record_entry
+from app.billing.plans import FREE_PLAN_ID, MONTHLY_PLAN_ID, SEMIANNUAL_PLAN_ID
+from app.billing.resets import compute_paid_cycle_end
+from app.billing.scheduler import reset_all_users
+from app.billing.timeutils import as_utc, now_utc
+from app.database import SessionLocal, engine
+
+def test_reset_all_users_over_mixed_plans():
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    current = now_utc()
+    overdue = current - timedelta(seconds=1)
+    last_month = current - timedelta(days=40)
+    anchor = current - timedelta(days=45)
+    rows = {
+        "free": dict(plan_id=FREE_PLAN_ID, credit_balance=3, last_credit_reset_at=last_month, next_credit_reset_at=overdue),
+        "paid": dict(
+            plan_id=SEMIANNUAL_PLAN_ID, credit_balance=20, billing_anchor_utc=anchor, plan_started_at=anchor,
+            plan_expires_at=current + timedelta(days=90), last_credit_reset_at=anchor, next_credit_reset_at=overdue,
+        ),
+        "expired": dict(
+            plan_id=MONTHLY_PLAN_ID, credit_balance=35, billing_anchor_utc=anchor, plan_started_at=anchor,
+            plan_expires_at=overdue, last_credit_reset_at=anchor, next_credit_reset_at=overdue,
+        ),
+        "not_due": dict(
+            plan_id=FREE_PLAN_ID, credit_balance=4, last_credit_reset_at=current, next_credit_reset_at=current + timedelta(days=5),
+        ),
+    }
+    users = {}
+    for name, values in rows.items():
+        user = models.User(email=f"reset-{name}@example.com", username=f"reset-{name}", hashed_password="", **values)
+        db.add(user); db.flush()
+        record_entry(db, user.id, user.credit_balance, user.credit_balance, "signup_grant")
+        users[name] = user
+    db.commit()
+
+    # Small batches so the mixed rows span several transactions
+    stats = reset_all_users(batch_size=2)
+    assert len(stats) >= 2
+
+    db.expire_all()
+    free, paid, expired, not_due = (users[name] for name in rows)
+    assert free.credit_balance == 10
+    assert as_utc(free.next_credit_reset_at) > current
+
+    assert paid.plan_id == SEMIANNUAL_PLAN_ID
+    assert paid.credit_balance == 100
+    assert as_utc(paid.next_credit_reset_at) == compute_paid_cycle_end(anchor, current)
+
+    assert expired.plan_id == FREE_PLAN_ID
+    assert expired.plan_expires_at is None
+    assert expired.credit_balance == 10
+
+    assert not_due.credit_balance == 4
+
+    for user in users.values():
+        assert reconstruct_balance(db, user.id) == user.credit_balance
+
+    # A second run finds nothing of ours due
+    reset_all_users(batch_size=2)
+    db.expire_all()
+    assert [user.credit_balance for user in users.values()] == [10, 100, 10, 4]
+    db.close()